@@ -0,0 +1,173 @@
+"""Micro-benchmarks for the game engine and the search players."""
+from typing import Dict, List, Tuple
+import contextlib
+import io
+import multiprocessing
+import random
+import resource
+import sys
+import time
+import tracemalloc
+import game_structure as gs
+import players as pl
+from players.mcts.mcts_node import MCTSNode
+from heuristics import SimpleHeuristic
+
+
+def sample_observation(seed: int = 3, turns: int = 12) -> 'gs.Observation':
+    """Return the observation reached after playing some random turns, to benchmark a mid-game state."""
+    random.seed(seed)
+    game_state = gs.GameState(gs.GameParameters())
+    game_state.reset()
+    forward_model = game_state.game_parameters.forward_model
+    for _ in range(turns):
+        while not forward_model.is_turn_finished(game_state):
+            forward_model.step(game_state, game_state.get_observation().get_random_action())
+        forward_model.on_turn_ended(game_state)
+    return game_state.get_observation()
+
+
+def sample_observations(count: int, turns: Tuple[int, ...] = (4, 8, 12, 16)) -> List['gs.Observation']:
+    """Return a corpus of observations from several seeds and game stages."""
+    return [sample_observation(seed, turn) for seed in range(count) for turn in turns]
+
+
+def clone_allocations(observation: 'gs.Observation', clones: int = 100, copy_on_write: bool = False) -> float:
+    """Return the number of memory blocks allocated per `Observation.clone()`."""
+    kept = []
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for _ in range(clones):
+        kept.append(observation.clone(copy_on_write))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return sum(stat.count_diff for stat in after.compare_to(before, 'filename')) / clones
+
+
+def search_statistics(player: 'pl.Player', observation: 'gs.Observation', budget: float) -> Tuple[float, int]:
+    """Return the iterations per second and the number of nodes of one turn search of an MCTS player."""
+    t0 = time.time()
+    player.compute_turn(observation, budget)
+    return player.iterations / (time.time() - t0), player.tree_size
+
+
+def tree_parallel_rates(observation: 'gs.Observation', budget: float, threads: Tuple[int, ...] = (1, 2, 4, 8)) -> Dict[int, float]:
+    """Return the iterations per second of `MCTSTreeParallelPlayer` for each number of threads."""
+    rates = {}
+    for count in threads:
+        player = pl.MCTSTreeParallelPlayer(SimpleHeuristic(), 8, threads=count, array_state=True)
+        rates[count] = search_statistics(player, observation, budget)[0]
+    return rates
+
+
+def branching_factors(observations: List['gs.Observation']) -> Tuple[float, float]:
+    """Return the mean number of actions of the observations, and the mean there would be with one set of card actions per copy of a card."""
+    actions = 0
+    per_copy = 0
+    for observation in observations:
+        cards = observation.player_0_cards if observation.current_turn == 0 else observation.player_1_cards
+        for action in observation.get_actions():
+            actions += 1
+            per_copy += cards.get_card_count(action.get_subject()) if type(action.get_subject()) is gs.Card else 1
+    return actions / len(observations), per_copy / len(observations)
+
+
+def decision_rates(observations: List['gs.Observation'], budget: float) -> Dict[str, float]:
+    """Return the decisions per second of OSLA and the iterations per second of MCTS over the observations."""
+    osla = pl.OSLAPlayer(SimpleHeuristic())
+    t0 = time.time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for observation in observations:
+            osla.think(observation, budget)
+    rates = {str(osla): len(observations) / (time.time() - t0)}
+    mcts = pl.MCTSPlayer(SimpleHeuristic(), 8)
+    rates[str(mcts)] = sum(search_statistics(mcts, observation, budget)[0] for observation in observations) / len(observations)
+    return rates
+
+
+def random_action_rate(observations: List['gs.Observation'], budget: float) -> float:
+    """Return the `get_random_action` samples per second over the observations."""
+    samples = 0
+    t0 = time.time()
+    while time.time() - t0 < budget:
+        for observation in observations:
+            observation.get_random_action()
+        samples += len(observations)
+    return samples / (time.time() - t0)
+
+
+def generation_rate(player: 'pl.OEPlayer', observations: List['gs.Observation'], budget: float) -> float:
+    """Return the generations per second of an OE player searching a turn from each observation."""
+    generations = 0
+    t0 = time.time()
+    for observation in observations:
+        player.compute_turn(observation, budget)
+        generations += player.generations
+    return generations / (time.time() - t0)
+
+
+def rollout_rate(observation: 'gs.Observation', budget: float) -> float:
+    """Return the rollouts per second of `MCTSNode.rollout`, which plays one on a copy-on-write clone of the observation."""
+    node = MCTSNode(observation, SimpleHeuristic(), None)
+    rollouts = 0
+    t0 = time.time()
+    while time.time() - t0 < budget:
+        node.rollout()
+        rollouts += 1
+    return rollouts / (time.time() - t0)
+
+
+def vector_game_rate(games: int, budget: float) -> Tuple[float, int]:
+    """Return the actions per second of a `VectorGame` driven by uniform random legal actions, and the games finished."""
+    vector_game = gs.VectorGame(gs.GameParameters(), games)
+    actions = 0
+    t0 = time.time()
+    while time.time() - t0 < budget:
+        vector_game.step([random.choice(indices) for indices in vector_game.get_action_indices()])
+        actions += games
+    return actions / (time.time() - t0), vector_game.finished
+
+
+def search_memory(player: 'pl.Player', budget: float) -> Tuple[float, float, int, int]:
+    """Return the nodes and iterations per second of one turn search of an MCTS player, with the peak RSS in KiB before and after it."""
+    observation = sample_observation()
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.time()
+    player.compute_turn(observation, budget)
+    elapsed = time.time() - t0
+    return player.tree_size / elapsed, player.iterations / elapsed, before, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def search_memory_in_process(player: 'pl.Player', budget: float) -> Tuple[float, float, int, int]:
+    """Run `search_memory` in a fresh process, so the peak RSS only depends on that search."""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(search_memory, (player, budget))
+
+
+if __name__ == "__main__":
+    observation = sample_observation()
+    print(f"Allocations per Observation.clone(): {clone_allocations(observation):.1f}")
+    print(f"Allocations per Observation.clone(copy_on_write=True): {clone_allocations(observation, copy_on_write=True):.1f}")
+    corpus = sample_observations(10)
+    actions, per_copy = branching_factors(corpus)
+    print(f"Branching factor: {actions:.1f} actions, {per_copy:.1f} with one set of card actions per copy")
+    for player, rate in decision_rates(corpus, 0.2).items():
+        print(f"{player} over {len(corpus)} states: {rate:.1f}/s")
+    print(f"Observation.get_random_action: {random_action_rate(corpus, 3):.0f} samples/s")
+    oe = pl.OEPlayer(SimpleHeuristic(), 50, 0.1, 0.25)
+    print(f"{oe} over {len(corpus)} states: {generation_rate(oe, corpus, 0.3):.0f} generations/s")
+    for player in (pl.MCTSPlayer(SimpleHeuristic(), 8, array_state=True), pl.MCTSTranspositionPlayer(SimpleHeuristic(), 8, array_state=True)):
+        iterations, tree_size = search_statistics(player, observation, 3)
+        print(f"{player}: {iterations:.0f} iterations/s, {tree_size} nodes")
+    gil = sys._is_gil_enabled() if hasattr(sys, "_is_gil_enabled") else True
+    for count, iterations in tree_parallel_rates(observation, 3).items():
+        print(f"MCTSTreeParallelPlayer with {count} threads (GIL {'on' if gil else 'off'}): {iterations:.0f} iterations/s")
+    rollouts = rollout_rate(observation, 3)
+    print(f"MCTSNode.rollout: {rollouts:.0f} rollouts/s, {1000 / rollouts:.2f} ms per rollout")
+    for games in (1, 64):
+        actions, finished = vector_game_rate(games, 3)
+        print(f"VectorGame of {games}: {actions:.0f} actions/s, {finished} games finished")
+    for player in (pl.MCTSPlayer(SimpleHeuristic(), 8), pl.MCTSReplayPlayer(SimpleHeuristic(), 8), pl.MCTSReplayPlayer(SimpleHeuristic(), 8, stride=2),
+                   pl.MCTSPlayer(SimpleHeuristic(), 8, array_state=True), pl.MCTSReplayPlayer(SimpleHeuristic(), 8, array_state=True)):
+        nodes, iterations, before, peak = search_memory_in_process(player, 6)
+        print(f"{player}{' on ArrayState' if player.array_state else ''}: {nodes:.0f} nodes/s, {iterations:.0f} iterations/s, peak RSS {peak / 1024:.1f} MiB ({(peak - before) / 1024:.1f} MiB in search)")
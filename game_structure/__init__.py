@@ -3,10 +3,15 @@ from game_structure.card_type import CardType
 from game_structure.card_value import CardValue
 from game_structure.card import Card
 from game_structure.card_collection import CardCollection
+from game_structure.deck import Deck
 from game_structure.unit import Unit
+from game_structure.board_occupancy import BoardOccupancy
 from game_structure.units_collection import UnitsCollection
 from game_structure.tile_type import TileType
 from game_structure.game import Game
+from game_structure.board_geometry import BoardGeometry
 from game_structure.game_parameters import GameParameters
 from game_structure.game_state import GameState
-from game_structure.observation import Observation
\ No newline at end of file
+from game_structure.observation import Observation
+from game_structure.array_state import ArrayState
+from game_structure.vector_game import VectorGame
\ No newline at end of file
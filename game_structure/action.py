@@ -1,10 +1,12 @@
 from typing import Tuple, Union
-from copy import deepcopy
 import game_structure as gs
 
 class Action:
     def __init__(self, subject: Union['gs.Unit', 'gs.Card'], unit: 'gs.Unit' = None, position: Tuple[int, int] = None) -> None:
-        """Actions stand for every possible action that can be taken per turn."""
+        """Actions stand for every possible action that can be taken per turn.
+
+        Units are handles: the forward model finds the acting and target units by `Unit.uid`, so actions
+        hold the units of the state they were built from instead of copies."""
         self.subject = subject
         self.unit = unit
         self.position = position
@@ -12,19 +14,13 @@ class Action:
 # region Methods
     def clone(self) -> 'Action':
         """Create new action with the same unit and pos."""
-        return Action(self.subject.clone(), self.unit.clone() if self.unit is not None else None, deepcopy(self.position) if self.position is not None else None)
+        return Action(self.subject, self.unit, self.position)
 
     def copy_into(self, other: 'Action') -> None:
-        """Deep copies the `Action` contents into another one."""
-        other.subject = self.subject.clone()
-        if self.unit is not None:
-            other.unit = self.unit.clone()
-        else:
-            other.unit = None
-        if self.position is not None:
-            other.position = deepcopy(self.position)
-        else:
-            other.position = None
+        """Copies the `Action` contents into another one."""
+        other.subject = self.subject
+        other.unit = self.unit
+        other.position = self.position
 # endregion
 
 # region Getters
@@ -39,6 +35,11 @@ class Action:
     def get_position(self) -> Tuple[int, int]:
         """Return position."""
         return self.position
+
+    def get_key(self) -> Tuple:
+        """Return a hashable key that tells the action apart from the others of the same state, also across processes."""
+        subject = self.subject.get_value().value if type(self.subject) is gs.Card else self.subject.get_pos()
+        return (subject, self.unit.get_pos() if self.unit is not None else None, self.position)
 # endregion
 
 # region Override
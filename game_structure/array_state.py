@@ -0,0 +1,714 @@
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from game_structure.unit import EQUIPEMENT_VALUES
+from game_structure.observation import KIND_ATTACK, KIND_HEAL, KIND_MOVE, KINDS
+from util.create_unit import ARCHETYPES, Archetype
+import game_structure as gs
+import util.sampling as sampling
+import util.zobrist as zobrist
+import random
+
+# Header fields
+TURN = 0
+ACTION_POINTS = 1
+SCORE = 2           # SCORE + player
+DRAW = 4            # DRAW + player, index of the next card to draw from the deck
+UNIT_COUNT = 6      # UNIT_COUNT + player
+CRYSTALS_HP = 8     # CRYSTALS_HP + player, total hp of the crystals alive
+ALIVE = 10          # ALIVE + player, number of units that are not crystals
+ATTACK = 12         # ATTACK + player, sum of the bonus attack of the units, in halves of a point
+HASH = 14           # HASH + player, Zobrist hash of the units and hand, equal to the one of the object collections
+NEXT_UID = 16       # NEXT_UID + player, id of the next unit of the player, see `UnitsCollection.next_uid`
+HAND_SIZE = 18      # HAND_SIZE + player, number of cards in the hand
+HEADER_SIZE = 20
+
+# Unit fields, relative to the start of a unit block
+U_VALUE = 0
+U_HP = 1
+U_TILE = 2
+U_ID = 3            # `Unit.uid`
+U_EQUIPEMENT = 4    # one counter per value in EQUIPEMENT_VALUES, like `Unit.equipement`
+UNIT_SIZE = U_EQUIPEMENT + len(EQUIPEMENT_VALUES)
+
+# Stats fields
+MAX_HP = 0
+SPEED = 1
+POWER = 2
+RANGE = 3
+RESISTANCE = 4
+
+CARD_VALUES: Tuple[Optional['gs.CardValue'], ...] = (None,) + tuple(gs.CardValue)
+CLERIC = gs.CardValue.CLERIC.value
+CRYSTAL = gs.CardValue.CRYSTAL.value
+HEAL_POTION = gs.CardValue.HEAL_POTION.value
+
+
+class ArrayLayout:
+    """Offsets and board geometry shared by every `ArrayState` of a game."""
+
+    def __init__(self, game_parameters: 'gs.GameParameters', board: Dict[Tuple[int, int], 'gs.TileType']) -> None:
+        self.width, self.height = game_parameters.board_size
+        self.tiles = self.width * self.height
+        self.max_units = self.tiles
+        self.hand = HEADER_SIZE     # one counter per card value and player, like `CardCollection.counts`
+        self.occupancy = self.hand + 2 * len(CARD_VALUES)
+        self.units = self.occupancy + self.tiles
+        self.size = self.units + 2 * self.max_units * UNIT_SIZE
+        self.board = board
+        self.positions = tuple((x, y) for x in range(self.width) for y in range(self.height))
+        self.attack_tiles = tuple(board[pos] == gs.TileType.ATTACK for pos in self.positions)
+        self.speed_tiles = tuple(board[pos] == gs.TileType.SPEED for pos in self.positions)
+        self.spawn_tiles = (
+            tuple(x * self.height + y for x in range(5) for y in range(4)),
+            tuple(x * self.height + y for x in range(5) for y in range(self.height - 4, self.height)),
+        )
+        self.stats = self.initiliaze_stats()
+
+    def initiliaze_stats(self) -> Tuple[Optional[Archetype], ...]:
+        """Build the unit archetypes table, indexed by card value."""
+        stats = [None] * len(CARD_VALUES)
+        for value, archetype in ARCHETYPES.items():
+            stats[value.value] = archetype
+        return tuple(stats)
+
+    def get_tile(self, pos: Tuple[int, int]) -> int:
+        """Return the flat tile index of a board position."""
+        return pos[0] * self.height + pos[1]
+
+
+class ArrayState:
+    """Struct-of-arrays game state that `SimpleForwardModel` can step directly.
+
+    Every mutable field lives in a single `array`, so cloning is one buffer copy. Decks are immutable
+    tuples shared between clones and consumed through a draw index. The object API (`UnitsCollection`,
+    `CardCollection`, `Unit`) is still available as read-only views built on demand."""
+
+    def __init__(self, game_parameters: 'gs.GameParameters', layout: 'ArrayLayout', decks: Tuple[Tuple[int, ...], Tuple[int, ...]], data: 'array') -> None:
+        self.game_parameters = game_parameters
+        self.layout = layout
+        self.decks = decks
+        self.data = data
+
+    @staticmethod
+    def from_observation(observation: Union['gs.GameState', 'gs.Observation']) -> 'ArrayState':
+        """Build an array state from a `GameState` or an `Observation`."""
+        if type(observation) is ArrayState:
+            return observation.clone()
+        layout = ArrayLayout(observation.game_parameters, observation.board)
+        decks = (
+            tuple(card.get_value().value for card in observation.player_0_deck.cards),
+            tuple(card.get_value().value for card in observation.player_1_deck.cards),
+        )
+        state = ArrayState(observation.game_parameters, layout, decks, array('q', bytes(8 * layout.size)))
+        data = state.data
+        data[TURN] = observation.current_turn
+        data[ACTION_POINTS] = observation.action_points_left
+        data[SCORE] = observation.player_0_score
+        data[SCORE + 1] = observation.player_1_score
+        data[DRAW] = observation.player_0_deck.index
+        data[DRAW + 1] = observation.player_1_deck.index
+        for player, cards in enumerate((observation.player_0_cards, observation.player_1_cards)):
+            for card in cards.get_cards():
+                state.add_card(player, card.get_value().value)
+        for player, units in enumerate((observation.player_0_units, observation.player_1_units)):
+            for unit in units.get_units():
+                slot = state.add_unit(player, unit.get_card().get_value().value, layout.get_tile(unit.get_pos()))
+                base = state.get_unit_base(player, slot)
+                data[base + U_ID] = unit.uid
+                state.set_hp(player, slot, unit.get_hp())
+                for item, count in zip(EQUIPEMENT_VALUES, unit.get_equipement_counts()):
+                    for _ in range(count):
+                        state.add_equipement(player, slot, item.value)
+            data[NEXT_UID + player] = units.next_uid
+        return state
+
+# region Methods
+    def clone(self, copy_on_write: bool = False) -> 'ArrayState':
+        """Clone the state with a single buffer copy, which is already cheaper than sharing it, so `copy_on_write` is ignored."""
+        return ArrayState(self.game_parameters, self.layout, self.decks, self.data[:])
+
+    def copy_into(self, other: 'ArrayState') -> None:
+        """Copy the state into another one."""
+        other.game_parameters = self.game_parameters
+        other.layout = self.layout
+        other.decks = self.decks
+        other.data[:] = self.data
+
+    def to_observation(self) -> 'gs.Observation':
+        """Build an object `Observation` with the same contents."""
+        observation = gs.Observation(None)
+        observation.game_parameters = self.game_parameters
+        observation.current_turn = self.current_turn
+        observation.action_points_left = self.action_points_left
+        observation.board = self.layout.board.copy()
+        observation.player_0_score = self.player_0_score
+        observation.player_1_score = self.player_1_score
+        observation.player_0_deck = self.player_0_deck
+        observation.player_1_deck = self.player_1_deck
+        observation.player_0_cards = self.player_0_cards
+        observation.player_1_cards = self.player_1_cards
+        observation.player_0_units = self.player_0_units
+        observation.player_1_units = self.player_1_units
+        observation.randomise_hidden_info = False
+        return observation
+
+    def add_card(self, player: int, value: int) -> None:
+        """Add a card value to the hand of the player."""
+        data = self.data
+        counter = self.layout.hand + player * len(CARD_VALUES) + value
+        data[HASH + player] ^= zobrist.key(zobrist.CARD, value, data[counter])
+        data[counter] += 1
+        data[HAND_SIZE + player] += 1
+
+    def remove_card(self, player: int, value: int) -> bool:
+        """Remove a card with the given value from the hand of the player."""
+        data = self.data
+        counter = self.layout.hand + player * len(CARD_VALUES) + value
+        if data[counter] == 0:
+            return False
+        data[counter] -= 1
+        data[HAND_SIZE + player] -= 1
+        data[HASH + player] ^= zobrist.key(zobrist.CARD, value, data[counter])
+        return True
+
+    def draw_card(self, player: int) -> int:
+        """Draw the next card value from the deck of the player, or 0 if the deck is empty."""
+        deck = self.decks[player]
+        index = self.data[DRAW + player]
+        if index >= len(deck):
+            return 0
+        self.data[DRAW + player] = index + 1
+        return deck[index]
+
+    def add_unit(self, player: int, value: int, tile: int) -> int:
+        """Spawn a unit with full hp on the given tile and return its slot."""
+        data = self.data
+        slot = data[UNIT_COUNT + player]
+        base = self.get_unit_base(player, slot)
+        data[base + U_VALUE] = value
+        data[base + U_HP] = self.layout.stats[value][MAX_HP]
+        data[base + U_TILE] = tile
+        data[base + U_ID] = data[NEXT_UID + player]
+        data[NEXT_UID + player] += 2
+        data[self.layout.occupancy + tile] = player * self.layout.max_units + slot + 1
+        data[UNIT_COUNT + player] = slot + 1
+        self.track_unit(player, slot)
+        return slot
+
+    def remove_unit(self, player: int, slot: int) -> None:
+        """Remove a unit, shifting the following ones so the collection order is preserved."""
+        data = self.data
+        layout = self.layout
+        count = data[UNIT_COUNT + player]
+        base = self.get_unit_base(player, slot)
+        end = self.get_unit_base(player, count)
+        self.track_unit(player, slot, -1)
+        data[layout.occupancy + data[base + U_TILE]] = 0
+        data[base:end - UNIT_SIZE] = data[base + UNIT_SIZE:end]
+        for i in range(end - UNIT_SIZE, end):
+            data[i] = 0
+        for moved in range(slot, count - 1):
+            data[layout.occupancy + data[self.get_unit_base(player, moved) + U_TILE]] = player * layout.max_units + moved + 1
+        data[UNIT_COUNT + player] = count - 1
+
+    def move_unit(self, player: int, slot: int, tile: int) -> None:
+        """Move a unit to a new tile."""
+        data = self.data
+        base = self.get_unit_base(player, slot)
+        data[HASH + player] ^= self.get_unit_hash(player, slot)
+        data[self.layout.occupancy + data[base + U_TILE]] = 0
+        data[base + U_TILE] = tile
+        data[self.layout.occupancy + tile] = player * self.layout.max_units + slot + 1
+        data[HASH + player] ^= self.get_unit_hash(player, slot)
+
+    def set_hp(self, player: int, slot: int, hp: int) -> None:
+        """Set unit hp, capped by its max hp."""
+        data = self.data
+        base = self.get_unit_base(player, slot)
+        value = data[base + U_VALUE]
+        hp = min(hp, self.layout.stats[value][MAX_HP])
+        if value == CRYSTAL:
+            data[CRYSTALS_HP + player] += max(hp, 0) - max(data[base + U_HP], 0)
+        x, y = self.layout.positions[data[base + U_TILE]]
+        data[HASH + player] ^= zobrist.key(zobrist.UNIT, value, x, y, data[base + U_HP]) ^ zobrist.key(zobrist.UNIT, value, x, y, hp)
+        data[base + U_HP] = hp
+
+    def add_equipement(self, player: int, slot: int, value: int) -> None:
+        """Equip a unit with a card value of `EQUIPEMENT_VALUES`."""
+        data = self.data
+        base = self.get_unit_base(player, slot)
+        counter = base + U_EQUIPEMENT + EQUIPEMENT_VALUES.index(CARD_VALUES[value])
+        x, y = self.layout.positions[data[base + U_TILE]]
+        data[HASH + player] ^= zobrist.key(zobrist.EQUIPEMENT, value, x, y, data[counter])
+        data[counter] += 1
+
+    def track_unit(self, player: int, slot: int, sign: int = 1) -> None:
+        """Add a unit to the score aggregates and the hash of the header, or take it out of them with `sign=-1`."""
+        data = self.data
+        base = self.get_unit_base(player, slot)
+        value = data[base + U_VALUE]
+        data[HASH + player] ^= self.get_unit_hash(player, slot)
+        if value == CRYSTAL:
+            data[CRYSTALS_HP + player] += sign * max(data[base + U_HP], 0)
+        else:
+            data[ALIVE + player] += sign
+        power = self.layout.stats[value][POWER]
+        data[ATTACK + player] += sign * (power if value == CLERIC else 2 * power)
+
+    def is_action_valid(self, action: 'gs.Action') -> bool:
+        """Checks if the given action is currently valid."""
+        player = self.current_turn
+        enemy = 1 - player
+        if action is None:
+            return self.get_available_count(player) > 0 or self.get_available_count(enemy) > 0
+        if action.get_subject() is None:
+            return False
+
+        layout = self.layout
+        if type(action.get_subject()) is gs.Unit:
+            slot = self.find_unit_slot(player, action.get_subject())
+            if slot < 0 or self.get_unit_value(player, slot) == CRYSTAL:
+                return False
+            if action.get_unit() is None:
+                # Unit is moving
+                return self.can_move_to(player, slot, action.get_position())
+            # Unit is attacking or healing
+            for owner in (player, enemy):
+                target_slot = self.find_unit_slot(owner, action.get_unit())
+                if target_slot >= 0:
+                    return self.is_in_range(player, slot, self.data[self.get_unit_base(owner, target_slot) + U_TILE])
+            return False
+
+        value = action.get_subject().get_value()
+        if self.get_card_count(player, value.value) == 0:
+            return False
+        if action.get_unit() is None and action.get_position() is None:
+            return True
+        if action.get_unit() is not None and action.get_position() is not None:
+            return False
+        if action.get_unit() is None:
+            # Inferno spell or heal potion is used or unit is summoned
+            tile = layout.get_tile(action.get_position())
+            if value.is_spell_value():
+                return self.get_unit_slot(enemy, tile) >= 0
+            if value.is_item_value():
+                return self.get_unit_slot(player, tile) >= 0
+            return tile in layout.spawn_tiles[player] and self.data[layout.occupancy + tile] == 0
+        # Equipement given to unit
+        return self.find_unit_slot(player, action.get_unit()) >= 0
+# endregion
+
+# region Getters
+    @property
+    def current_turn(self) -> int:
+        return self.data[TURN]
+
+    @current_turn.setter
+    def current_turn(self, value: int) -> None:
+        self.data[TURN] = value
+
+    @property
+    def action_points_left(self) -> int:
+        return self.data[ACTION_POINTS]
+
+    @action_points_left.setter
+    def action_points_left(self, value: int) -> None:
+        self.data[ACTION_POINTS] = value
+
+    @property
+    def player_0_score(self) -> int:
+        return self.data[SCORE]
+
+    @player_0_score.setter
+    def player_0_score(self, value: int) -> None:
+        self.data[SCORE] = value
+
+    @property
+    def player_1_score(self) -> int:
+        return self.data[SCORE + 1]
+
+    @player_1_score.setter
+    def player_1_score(self, value: int) -> None:
+        self.data[SCORE + 1] = value
+
+    @property
+    def board(self) -> Dict[Tuple[int, int], 'gs.TileType']:
+        return self.layout.board
+
+    @property
+    def player_0_units(self) -> 'gs.UnitsCollection':
+        return self.get_units_view(0)
+
+    @property
+    def player_1_units(self) -> 'gs.UnitsCollection':
+        return self.get_units_view(1)
+
+    @property
+    def player_0_cards(self) -> 'gs.CardCollection':
+        return self.get_cards_view(self.get_hand(0))
+
+    @property
+    def player_1_cards(self) -> 'gs.CardCollection':
+        return self.get_cards_view(self.get_hand(1))
+
+    @property
+    def player_0_deck(self) -> 'gs.Deck':
+        return self.get_deck_view(0)
+
+    @property
+    def player_1_deck(self) -> 'gs.Deck':
+        return self.get_deck_view(1)
+
+    def get_unit_base(self, player: int, slot: int) -> int:
+        """Return the buffer offset of a unit slot."""
+        return self.layout.units + (player * self.layout.max_units + slot) * UNIT_SIZE
+
+    def get_unit_count(self, player: int) -> int:
+        """Return the number of units (crystals included) of the player."""
+        return self.data[UNIT_COUNT + player]
+
+    def get_unit_value(self, player: int, slot: int) -> int:
+        """Return the card value of a unit slot."""
+        return self.data[self.get_unit_base(player, slot) + U_VALUE]
+
+    def get_unit_slot(self, player: int, tile: int) -> int:
+        """Return the slot of the unit of the player standing on the tile, or -1."""
+        code = self.data[self.layout.occupancy + tile] - 1
+        if code < 0 or code // self.layout.max_units != player:
+            return -1
+        return code % self.layout.max_units
+
+    def find_unit_slot(self, player: int, unit: 'gs.Unit') -> int:
+        """Return the slot of the unit of the player with the `Unit.uid` of the handle, or -1, looking first at the tile of the handle."""
+        slot = self.get_unit_slot(player, self.layout.get_tile(unit.get_pos()))
+        if slot >= 0 and self.is_same_unit(player, slot, unit):
+            return slot
+        data = self.data
+        for slot in range(data[UNIT_COUNT + player]):
+            if data[self.get_unit_base(player, slot) + U_ID] == unit.uid:
+                return slot
+        return -1
+
+    def get_unit_hash(self, player: int, slot: int) -> int:
+        """Return the Zobrist hash of a unit, equal to `gs.Unit.get_hash` of its view."""
+        data = self.data
+        base = self.get_unit_base(player, slot)
+        x, y = self.layout.positions[data[base + U_TILE]]
+        value = zobrist.key(zobrist.UNIT, data[base + U_VALUE], x, y, data[base + U_HP])
+        if not any(data[base + U_EQUIPEMENT:base + UNIT_SIZE]):
+            return value
+        for i, equipement in enumerate(EQUIPEMENT_VALUES):
+            for count in range(data[base + U_EQUIPEMENT + i]):
+                value ^= zobrist.key(zobrist.EQUIPEMENT, equipement.value, x, y, count)
+        return value
+
+    def state_hash(self) -> int:
+        """Return the Zobrist hash of the units, hands, current turn and action points left, equal to `gs.Observation.state_hash`."""
+        data = self.data
+        return zobrist.state_key(data[HASH], data[HASH + 1], data[TURN], data[ACTION_POINTS])
+
+    def get_available_count(self, player: int) -> int:
+        """Return the number of units that are not crystals."""
+        return self.data[ALIVE + player]
+
+    def get_hand(self, player: int) -> List[int]:
+        """Return the card values in the hand of the player, one per copy, ordered by value."""
+        hand = self.layout.hand + player * len(CARD_VALUES)
+        return [value for value in range(1, len(CARD_VALUES)) for _ in range(self.data[hand + value])]
+
+    def get_hand_values(self, player: int) -> List[int]:
+        """Return the different card values in the hand of the player, ordered by value."""
+        hand = self.layout.hand + player * len(CARD_VALUES)
+        return [value for value in range(1, len(CARD_VALUES)) if self.data[hand + value] > 0]
+
+    def get_hand_size(self, player: int) -> int:
+        """Return the number of cards in the hand of the player."""
+        return self.data[HAND_SIZE + player]
+
+    def get_card_count(self, player: int, value: int) -> int:
+        """Return the number of copies of a card value in the hand of the player."""
+        return self.data[self.layout.hand + player * len(CARD_VALUES) + value]
+
+    def get_unit_moves(self, player: int, slot: int) -> List[Tuple[int, int]]:
+        """Return the free positions a unit can move to."""
+        data = self.data
+        layout = self.layout
+        base = self.get_unit_base(player, slot)
+        tile = data[base + U_TILE]
+        speed = layout.stats[data[base + U_VALUE]][SPEED] + (1 if layout.speed_tiles[tile] else 0)
+        occupancy = layout.occupancy
+        height = layout.height
+        return [pos for pos in self.game_parameters.get_geometry().get_moves(layout.positions[tile], speed) if data[occupancy + pos[0] * height + pos[1]] == 0]
+
+    def get_slots_in_range(self, player: int, slot: int, owner: int) -> List[int]:
+        """Return the slots of the units of `owner` that are in range of the given unit."""
+        data = self.data
+        layout = self.layout
+        base = self.get_unit_base(player, slot)
+        tiles = self.game_parameters.get_geometry().get_tiles_in_range(layout.positions[data[base + U_TILE]], layout.stats[data[base + U_VALUE]][RANGE])
+        return [other for other in range(data[UNIT_COUNT + owner]) if layout.positions[data[self.get_unit_base(owner, other) + U_TILE]] in tiles]
+
+    def get_spawn_positions(self, player: int) -> List[Tuple[int, int]]:
+        """Return the free positions where the player can summon a unit."""
+        occupancy = self.layout.occupancy
+        return [self.layout.positions[tile] for tile in self.layout.spawn_tiles[player] if self.data[occupancy + tile] == 0]
+
+    def get_unit_view(self, player: int, slot: int) -> 'gs.Unit':
+        """Materialise a unit slot as a `Unit` object."""
+        data = self.data
+        base = self.get_unit_base(player, slot)
+        value = CARD_VALUES[data[base + U_VALUE]]
+        return gs.Unit.from_archetype(gs.Card(value, gs.CardType.UNIT), self.layout.stats[value.value], data[base + U_HP],
+                                      self.layout.positions[data[base + U_TILE]], data[base + U_EQUIPEMENT:base + UNIT_SIZE].tolist(), data[base + U_ID])
+
+    def get_units_view(self, player: int) -> 'gs.UnitsCollection':
+        """Materialise the units of the player as a `UnitsCollection`."""
+        units = gs.UnitsCollection(player)
+        for slot in range(self.data[UNIT_COUNT + player]):
+            units.add_unit(self.get_unit_view(player, slot))
+        units.next_uid = self.data[NEXT_UID + player]
+        return units
+
+    def get_cards_view(self, values: List[int]) -> 'gs.CardCollection':
+        """Materialise a list of card values as a `CardCollection`."""
+        cards = gs.CardCollection()
+        for value in values:
+            cards.add_card(gs.Card(CARD_VALUES[value], CARD_VALUES[value].get_card_type()))
+        return cards
+
+    def get_deck_view(self, player: int) -> 'gs.Deck':
+        """Materialise the deck of the player as a `Deck` with the same draw index."""
+        cards = tuple(gs.Card(CARD_VALUES[value], CARD_VALUES[value].get_card_type()) for value in self.decks[player])
+        return gs.Deck(cards, self.data[DRAW + player])
+
+    def get_actions(self) -> List['gs.Action']:
+        """Get all the possible actions for the current player."""
+        actions = []
+        player = self.current_turn
+        enemy = 1 - player
+        data = self.data
+        layout = self.layout
+        positions = layout.positions
+        own_views = [self.get_unit_view(player, slot) for slot in range(data[UNIT_COUNT + player])]
+        enemy_views = [self.get_unit_view(enemy, slot) for slot in range(data[UNIT_COUNT + enemy])]
+        available = [slot for slot, unit in enumerate(own_views) if unit.get_card().get_value().is_unit_value()]
+
+        for slot in available:
+            unit = own_views[slot]
+            if unit.get_card().get_value() == gs.CardValue.CLERIC:
+                for target in self.get_slots_in_range(player, slot, player):
+                    actions.append(gs.Action(unit, own_views[target], None))
+            for target in self.get_slots_in_range(player, slot, enemy):
+                actions.append(gs.Action(unit, enemy_views[target], None))
+            for position in self.get_unit_moves(player, slot):
+                actions.append(gs.Action(unit, None, position))
+
+        for value in self.get_hand_values(player):
+            card_value = CARD_VALUES[value]
+            card = gs.Card(card_value, card_value.get_card_type())
+            if not self.is_playable(card_value, len(available), len(enemy_views)):
+                actions.append(gs.Action(card, None, None))
+            elif card_value.is_spell_value():
+                for target in enemy_views:
+                    actions.append(gs.Action(card, None, target.get_pos()))
+            elif value == HEAL_POTION:
+                for slot in available:
+                    actions.append(gs.Action(card, None, positions[data[self.get_unit_base(player, slot) + U_TILE]]))
+            elif card_value.is_item_value():
+                for slot in available:
+                    actions.append(gs.Action(card, own_views[slot], None))
+            else:
+                for position in self.get_spawn_positions(player):
+                    actions.append(gs.Action(card, None, position))
+        return actions
+
+    def iter_actions(self) -> Iterator['gs.Action']:
+        """Yield the actions of `get_actions` one by one, decoding each index of `get_action_indices` only when it is reached."""
+        indices = self.get_action_indices()
+        if indices[0] == self.game_parameters.get_geometry().pass_action:
+            return
+        for index in indices:
+            yield self.decode_action(index)
+
+    def count_actions(self) -> int:
+        """Get the number of actions of `get_actions` without building them."""
+        indices = self.get_action_indices()
+        return 0 if indices[0] == self.game_parameters.get_geometry().pass_action else len(indices)
+
+    def action_at(self, index: int) -> 'gs.Action':
+        """Get the action at the given index of `get_actions`, building only that one."""
+        indices = self.get_action_indices()
+        if index >= len(indices) or indices[0] == self.game_parameters.get_geometry().pass_action:
+            raise IndexError("action index out of range")
+        return self.decode_action(indices[index])
+
+    def get_action(self, key: Tuple) -> 'gs.Action':
+        """Rebuild the action of the current player with the given `Action.get_key()`."""
+        player = self.current_turn
+        subject, target, position = key
+        if type(subject) is int:
+            value = CARD_VALUES[subject]
+            subject = gs.Card(value, value.get_card_type())
+        else:
+            slot = self.get_unit_slot(player, self.layout.get_tile(subject))
+            subject = self.get_unit_view(player, slot) if slot >= 0 else None
+        if target is not None:
+            tile = self.layout.get_tile(target)
+            owner = player if self.get_unit_slot(player, tile) >= 0 else 1 - player
+            slot = self.get_unit_slot(owner, tile)
+            target = self.get_unit_view(owner, slot) if slot >= 0 else None
+        return gs.Action(subject, target, position)
+
+    def get_action_indices(self) -> List[int]:
+        """Return the encoded actions of `get_actions`, computed from the buffer without building `Action` objects."""
+        player = self.current_turn
+        enemy = 1 - player
+        data = self.data
+        layout = self.layout
+        geometry = self.game_parameters.get_geometry()
+        tiles = geometry.tiles
+        stride = tiles + 1
+        indices = []
+        available = [slot for slot in range(data[UNIT_COUNT + player]) if data[self.get_unit_base(player, slot) + U_VALUE] != CRYSTAL]
+        available_tiles = [data[self.get_unit_base(player, slot) + U_TILE] for slot in available]
+
+        for slot, tile in zip(available, available_tiles):
+            subject = tile * stride
+            if data[self.get_unit_base(player, slot) + U_VALUE] == CLERIC:
+                indices.extend(subject + data[self.get_unit_base(player, target) + U_TILE] for target in self.get_slots_in_range(player, slot, player))
+            indices.extend(subject + data[self.get_unit_base(enemy, target) + U_TILE] for target in self.get_slots_in_range(player, slot, enemy))
+            indices.extend(subject + layout.get_tile(position) for position in self.get_unit_moves(player, slot))
+
+        enemy_tiles = [data[self.get_unit_base(enemy, slot) + U_TILE] for slot in range(data[UNIT_COUNT + enemy])]
+        for value in self.get_hand_values(player):
+            card_value = CARD_VALUES[value]
+            subject = (tiles + value - 1) * stride
+            if not self.is_playable(card_value, len(available), len(enemy_tiles)):
+                indices.append(subject + tiles)
+            elif card_value.is_spell_value():
+                indices.extend(subject + tile for tile in enemy_tiles)
+            elif card_value.is_item_value():
+                indices.extend(subject + tile for tile in available_tiles)
+            else:
+                indices.extend(subject + tile for tile in layout.spawn_tiles[player] if data[layout.occupancy + tile] == 0)
+        return indices if len(indices) > 0 else [geometry.pass_action]
+
+    def encode_action(self, action: 'gs.Action') -> int:
+        """Return the index of an action in the action space of `BoardGeometry`."""
+        return self.game_parameters.get_geometry().encode_action(action)
+
+    def decode_action(self, index: int) -> 'gs.Action':
+        """Rebuild the action of the current player encoded by `encode_action`."""
+        data = self.data
+        layout = self.layout
+        key = self.game_parameters.get_geometry().get_action_key(index, lambda pos: data[layout.occupancy + layout.get_tile(pos)] != 0)
+        return self.get_action(key) if key is not None else None
+
+    def get_random_action(self) -> 'gs.Action':
+        """Gets a random action that is currently valid, drawing the same random numbers as `Observation.get_random_action`."""
+        player = self.current_turn
+        enemy = 1 - player
+        data = self.data
+        layout = self.layout
+        geometry = self.game_parameters.get_geometry()
+        occupancy = layout.occupancy
+
+        slot = None
+        if data[HAND_SIZE + player] == 0 or not random.getrandbits(1):
+            # Play with a unit, checking each kind of action once for the units drawn
+            slot, kinds = sampling.choice(range(data[UNIT_COUNT + player]), lambda slot: self.get_unit_kinds(player, slot))
+        if slot is not None:
+            action = random.choice(KINDS[kinds])
+            unit = self.get_unit_view(player, slot)
+            if action == KIND_MOVE:
+                base = self.get_unit_base(player, slot)
+                tile = data[base + U_TILE]
+                speed = layout.stats[data[base + U_VALUE]][SPEED] + (1 if layout.speed_tiles[tile] else 0)
+                return gs.Action(unit, None, sampling.choice(geometry.get_moves(layout.positions[tile], speed), lambda pos: data[occupancy + layout.get_tile(pos)] == 0)[0])
+            owner = enemy if action == KIND_ATTACK else player
+            target = sampling.choice(range(data[UNIT_COUNT + owner]), lambda other: self.is_in_range(player, slot, data[self.get_unit_base(owner, other) + U_TILE]))[0]
+            return gs.Action(unit, self.get_unit_view(owner, target), None)
+        if data[HAND_SIZE + player] == 0:
+            return None
+
+        # Play with a card
+        hand = self.get_hand(player)
+        available_count = self.get_available_count(player)
+        enemy_count = data[UNIT_COUNT + enemy]
+        avaliable_cards = [value for value in hand if self.is_playable(CARD_VALUES[value], available_count, enemy_count)]
+        if len(avaliable_cards) == 0:
+            value = CARD_VALUES[random.choice(hand)]
+            return gs.Action(gs.Card(value, value.get_card_type()), None, None)
+        value = CARD_VALUES[random.choice(avaliable_cards)]
+        card = gs.Card(value, value.get_card_type())
+
+        if value.is_spell_value():
+            return gs.Action(card, None, layout.positions[data[self.get_unit_base(enemy, random.randrange(enemy_count)) + U_TILE]])
+        elif value.is_item_value():
+            target = sampling.choice(range(data[UNIT_COUNT + player]), lambda slot: data[self.get_unit_base(player, slot) + U_VALUE] != CRYSTAL)[0]
+            if value == gs.CardValue.HEAL_POTION:
+                return gs.Action(card, None, layout.positions[data[self.get_unit_base(player, target) + U_TILE]])
+            return gs.Action(card, self.get_unit_view(player, target), None)
+        else:
+            position = sampling.choice(geometry.get_spawn_positions(player), lambda pos: data[occupancy + layout.get_tile(pos)] == 0)[0]
+            if position is None:
+                raise IndexError("no free position to summon the unit")
+            return gs.Action(card, None, position)
+# endregion
+
+# region Helpers
+    def is_playable(self, value: 'gs.CardValue', available_count: int, enemy_count: int) -> bool:
+        """Check if a card value is playable, like `Card.is_playable`."""
+        return value.is_unit_value() or (value.is_spell_value() and enemy_count > 0) or (value.is_item_value() and available_count > 0)
+
+    def get_unit_kinds(self, player: int, slot: int) -> int:
+        """Get the flags of the kinds of action a unit can take, like `Observation.get_unit_kinds`."""
+        data = self.data
+        layout = self.layout
+        geometry = self.game_parameters.get_geometry()
+        base = self.get_unit_base(player, slot)
+        value = data[base + U_VALUE]
+        if value == CRYSTAL:
+            return 0
+        tile = data[base + U_TILE]
+        pos = layout.positions[tile]
+        speed = layout.stats[value][SPEED] + (1 if layout.speed_tiles[tile] else 0)
+        tiles = geometry.get_tiles_in_range(pos, layout.stats[value][RANGE])
+        kinds = KIND_MOVE if any(data[layout.occupancy + layout.get_tile(move)] == 0 for move in geometry.get_moves(pos, speed)) else 0
+        if any(layout.positions[data[self.get_unit_base(1 - player, other) + U_TILE]] in tiles for other in range(data[UNIT_COUNT + 1 - player])):
+            kinds |= KIND_ATTACK
+        if value == CLERIC and any(layout.positions[data[self.get_unit_base(player, other) + U_TILE]] in tiles for other in range(data[UNIT_COUNT + player])):
+            kinds |= KIND_HEAL
+        return kinds
+
+    def can_move_to(self, player: int, slot: int, pos: Tuple[int, int]) -> bool:
+        """Check if the position is one of `get_unit_moves`, without building the list."""
+        if pos is None:
+            return False
+        data = self.data
+        layout = self.layout
+        base = self.get_unit_base(player, slot)
+        tile = data[base + U_TILE]
+        speed = layout.stats[data[base + U_VALUE]][SPEED] + (1 if layout.speed_tiles[tile] else 0)
+        return self.game_parameters.get_geometry().is_move(layout.positions[tile], pos, speed) and data[layout.occupancy + layout.get_tile(pos)] == 0
+
+    def is_in_range(self, player: int, slot: int, tile: int) -> bool:
+        """Check if a tile is in range of the given unit."""
+        base = self.get_unit_base(player, slot)
+        tiles = self.game_parameters.get_geometry().get_tiles_in_range(self.layout.positions[self.data[base + U_TILE]], self.layout.stats[self.data[base + U_VALUE]][RANGE])
+        return self.layout.positions[tile] in tiles
+
+    def is_same_unit(self, player: int, slot: int, unit: 'gs.Unit') -> bool:
+        """Check if a unit slot holds the given `Unit` handle."""
+        return self.data[self.get_unit_base(player, slot) + U_ID] == unit.uid
+# endregion
+
+# region Override
+    def __str__(self):
+        return (f"TURN: {self.current_turn!s}\n"
+                f"SCORE P1: {self.player_0_score!s}\n"
+                f"CARDS P1: {self.player_0_cards!s}\n"
+                f"SCORE P2: {self.player_1_score!s}\n"
+                f"SCORE P2: {self.player_1_cards!s}\n"
+                f"ACTION POINTS LEFT: {self.action_points_left!s}")
+# endregion
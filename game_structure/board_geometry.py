@@ -0,0 +1,94 @@
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+import game_structure as gs
+
+class BoardGeometry:
+    """Movement and range neighbourhoods of every tile for a fixed board size, computed once per speed or range."""
+
+    def __init__(self, board_size: Tuple[int, int]) -> None:
+        self.board_size = board_size
+        self.positions = tuple((x, y) for x in range(board_size[0]) for y in range(board_size[1]))
+        self.moves: Dict[int, Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]]] = {}
+        self.tiles_in_range: Dict[int, Dict[Tuple[int, int], FrozenSet[Tuple[int, int]]]] = {}
+        # Encoded actions are `subject * (tiles + 1) + target`: the subject is a tile or `tiles + value - 1` for a card, the target
+        # a tile or `tiles` for none. The last index is the pass action, a `None` action only legal when nothing else is.
+        self.tiles = len(self.positions)
+        self.action_space = (self.tiles + len(gs.CardValue)) * (self.tiles + 1) + 1
+        self.pass_action = self.action_space - 1
+        # Summoning zone of each player, in the order of `UnitsCollection.get_avalible_positions_for_spawn`
+        self.spawn_positions = (
+            tuple((x, y) for x in range(5) for y in range(4)),
+            tuple((x, y) for x in range(5) for y in range(board_size[1] - 4, board_size[1])),
+        )
+
+# region Methods
+    def build_moves(self, speed: int) -> Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]]:
+        """Build the table of tiles reachable from every tile with the given speed, in the order of `Unit.possible_moves`."""
+        width, height = self.board_size
+        moves = {}
+        for pos in self.positions:
+            moves[pos] = tuple((x, y) for x in range(max(pos[0] - speed, 0), min(pos[0] + speed + 1, width))
+                               for y in range(max(pos[1] - speed, 0), min(pos[1] + speed + 1, height)) if (x, y) != pos)
+        return moves
+
+    def build_tiles_in_range(self, unit_range: int) -> Dict[Tuple[int, int], FrozenSet[Tuple[int, int]]]:
+        """Build the table of tiles within the given Manhattan distance of every tile."""
+        return {pos: frozenset(other for other in self.positions if unit_range >= abs(pos[0] - other[0]) + abs(pos[1] - other[1]))
+                for pos in self.positions}
+# endregion
+
+# region Getters
+    def get_tile(self, pos: Tuple[int, int]) -> int:
+        """Return the flat tile index of a board position."""
+        return pos[0] * self.board_size[1] + pos[1]
+
+    def encode_action(self, action: 'gs.Action') -> int:
+        """Return the index of an action in the action space, `pass_action` for `None`."""
+        if action is None:
+            return self.pass_action
+        subject, unit, position = action.get_key()
+        subject = self.tiles + subject - 1 if type(subject) is int else self.get_tile(subject)
+        target = unit if unit is not None else position
+        return subject * (self.tiles + 1) + (self.get_tile(target) if target is not None else self.tiles)
+
+    def get_action_key(self, index: int, is_occupied: Callable[[Tuple[int, int]], bool]) -> Optional[Tuple]:
+        """Return the `Action.get_key()` of an encoded action, or None for the pass action.
+
+        Items other than the heal potion target a unit, other cards a position. A unit targets the unit
+        on the tile if there is one, as it can only move to a free tile."""
+        if index == self.pass_action:
+            return None
+        subject, target = divmod(index, self.tiles + 1)
+        target = self.positions[target] if target < self.tiles else None
+        if subject >= self.tiles:
+            value = subject - self.tiles + 1
+            if target is not None and value != gs.CardValue.HEAL_POTION.value and gs.CardValue(value).is_item_value():
+                return (value, target, None)
+            return (value, None, target)
+        if target is not None and is_occupied(target):
+            return (self.positions[subject], target, None)
+        return (self.positions[subject], None, target)
+
+    def get_moves(self, pos: Tuple[int, int], speed: int) -> Tuple[Tuple[int, int], ...]:
+        """Return the tiles a unit on `pos` can reach with the given speed, ignoring other units."""
+        moves = self.moves.get(speed)
+        if moves is None:
+            moves = self.moves[speed] = self.build_moves(speed)
+        return moves[pos]
+
+    def is_move(self, pos: Tuple[int, int], target: Tuple[int, int], speed: int) -> bool:
+        """Check if `target` is one of `get_moves(pos, speed)` without scanning them."""
+        x, y = target
+        return target != pos and abs(x - pos[0]) <= speed and abs(y - pos[1]) <= speed \
+            and 0 <= x < self.board_size[0] and 0 <= y < self.board_size[1]
+
+    def get_spawn_positions(self, player: int) -> Tuple[Tuple[int, int], ...]:
+        """Return the positions of the summoning zone of the player, taken or not."""
+        return self.spawn_positions[player]
+
+    def get_tiles_in_range(self, pos: Tuple[int, int], unit_range: int) -> FrozenSet[Tuple[int, int]]:
+        """Return the tiles in range of a unit on `pos` with the given range."""
+        tiles = self.tiles_in_range.get(unit_range)
+        if tiles is None:
+            tiles = self.tiles_in_range[unit_range] = self.build_tiles_in_range(unit_range)
+        return tiles[pos]
+# endregion
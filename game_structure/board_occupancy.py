@@ -0,0 +1,28 @@
+from typing import Dict, Tuple
+import game_structure as gs
+
+class BoardOccupancy:
+    """Read-only view over the occupancy index of one or more `UnitsCollection`, with O(1) free-tile checks."""
+    __slots__ = ('grids',)
+
+    def __init__(self, *grids: Dict[Tuple[int, int], 'gs.Unit']) -> None:
+        self.grids = grids
+
+# region Getters
+    def get_unit_in_position(self, pos: Tuple[int, int]) -> 'gs.Unit':
+        """Return the unit in the given position, or None if the tile is free."""
+        for grid in self.grids:
+            unit = grid.get(pos)
+            if unit is not None:
+                return unit
+        return None
+# endregion
+
+# region Override
+    def __contains__(self, pos: Tuple[int, int]) -> bool:
+        """Check if the given position is taken."""
+        for grid in self.grids:
+            if pos in grid:
+                return True
+        return False
+# endregion
@@ -1,27 +1,34 @@
+from typing import Dict, Tuple
 import game_structure as gs
 
 class Card:
-    def __init__(self, value: 'gs.CardValue', card_type: 'gs.CardType'):
-        """Card is a base class for all cards that a player can use in the game."""
-        self.value = value
-        self.card_type = card_type
+    """Card is a base class for all cards that a player can use in the game.
+
+    Cards are immutable and interned: there is a single `Card` per value and type, so cloning returns
+    the same object and equality is identity."""
+    __slots__ = ('value', 'card_type')
+    _interned: Dict[Tuple['gs.CardValue', 'gs.CardType'], 'Card'] = {}
+
+    def __new__(cls, value: 'gs.CardValue', card_type: 'gs.CardType') -> 'Card':
+        card = cls._interned.get((value, card_type))
+        if card is None:
+            card = super().__new__(cls)
+            object.__setattr__(card, 'value', value)
+            object.__setattr__(card, 'card_type', card_type)
+            cls._interned[(value, card_type)] = card
+        return card
 
 # region Methods
     def clone(self) -> 'Card':
-        """Create new card with the same info."""
-        return Card(self.value, self.card_type)
-
-    def copy_into(self, other: 'Card') -> None:
-        """Copies the card contents into another one."""
-        other.value = self.value
-        other.card_type = self.card_type
+        """Return the card itself, as cards are immutable."""
+        return self
 # endregion
 
 # region Getters
     def get_value(self) -> 'gs.CardValue':
         """Get value."""
         return self.value
-    
+
     def get_card_type(self) -> 'gs.CardType':
         """Get card type."""
         return self.card_type
@@ -30,14 +37,23 @@ class Card:
 # region Helpers
     def is_playable(self, units: 'gs.UnitsCollection', enemies: 'gs.UnitsCollection') -> bool:
         """Check if card is playable."""
-        return self.value.is_unit_value() or (self.value.is_spell_value() and len(enemies.get_units()) > 0) or (self.value.is_item_value() and len(units.get_available_units()) > 0)
+        return self.value.is_unit_value() or (self.value.is_spell_value() and len(enemies.get_units()) > 0) or (self.value.is_item_value() and units.get_units_alive() > 0)
 # endregion
 
 # region Override
     def __str__(self) -> str:
         """Get string representation of card."""
         return f"Card[{self.value.name}]"
-    
-    def __eq__(self, __o: object) -> bool:
-        return self.value.name == __o.value.name and self.card_type.name == __o.card_type.name
-# endregion
\ No newline at end of file
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError("Card is immutable")
+
+    def __copy__(self) -> 'Card':
+        return self
+
+    def __deepcopy__(self, memo: dict) -> 'Card':
+        return self
+
+    def __reduce__(self):
+        return (Card, (self.value, self.card_type))
+# endregion
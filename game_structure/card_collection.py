@@ -1,64 +1,116 @@
-from typing import List
+from typing import List, Tuple
 import game_structure as gs
+import util.zobrist as zobrist
+
+CARDS: Tuple['gs.Card', ...] = (None,) + tuple(gs.Card(value, value.get_card_type()) for value in gs.CardValue)
 
 class CardCollection:
     def __init__(self):
-        self.cards: List['gs.Card'] = []
+        self.counts: List[int] = [0] * len(CARDS)     # number of copies of each card, indexed by `CardValue.value`
+        self.size = 0
+        self.hash = 0   # Zobrist hash of the cards, which does not depend on their order
+        self.shared = False     # shared by copy-on-write clones, so it is never changed again, see `share`
 
 # region Methods
     def clone(self) -> 'CardCollection':
         """Create new collection with the same cards."""
         new_card_collection = CardCollection()
-        for card in self.cards:
-            new_card_collection.add_card(card.clone())
+        new_card_collection.counts = self.counts.copy()
+        new_card_collection.size = self.size
+        new_card_collection.hash = self.hash
         return new_card_collection
 
+    def share(self) -> 'CardCollection':
+        """Mark the collection as shared by copy-on-write clones and return it. Its holders `clone` it before changing it."""
+        self.shared = True
+        return self
+
     def add_card(self, card: 'gs.Card'):
         """Add a card to the collection."""
-        self.cards.append(card)
+        value = card.value.value
+        self.hash ^= zobrist.key(zobrist.CARD, value, self.counts[value])
+        self.counts[value] += 1
+        self.size += 1
 
     def add_cards(self, cards: List['gs.Card']):
         """Add a list of cards to the collection."""
-        self.cards.extend(cards)
+        for card in cards:
+            self.add_card(card)
 
     def remove_card(self, card: 'gs.Card'):
-        """Remove a card from the collection."""
-        self.cards.remove(card)
+        """Remove a copy of the card from the collection, raising `ValueError` if it has none, like `list.remove`."""
+        value = card.value.value
+        if self.counts[value] == 0:
+            raise ValueError(f"{card} is not in the collection")
+        self.counts[value] -= 1
+        self.size -= 1
+        self.hash ^= zobrist.key(zobrist.CARD, value, self.counts[value])
 # endregion
 
 # region Getters
     def get_cards(self) -> List['gs.Card']:
-        """Get all cards."""
-        return self.cards
-    
-    def get_first_card(self) -> 'gs.Card':
-        """Get the first card from the collection."""
-        if len(self.cards) == 0:
-            return None
-        return self.cards.pop(0)
-    
-    def get_number_cards(self) -> bool:
+        """Get all cards, with one entry per copy, ordered by value."""
+        return [card for card, count in zip(CARDS, self.counts) for _ in range(count)]
+
+    def get_unique_cards(self) -> List['gs.Card']:
+        """Get the different cards in the collection, ordered by value."""
+        return [card for card, count in zip(CARDS, self.counts) if count > 0]
+
+    def get_card_at(self, index: int) -> 'gs.Card':
+        """Get the card at the given index of `get_cards`, without building the list."""
+        for card, count in zip(CARDS, self.counts):
+            if index < count:
+                return card
+            index -= count
+        raise IndexError("card index out of range")
+
+    def get_playable_card_at(self, index: int, units: 'gs.UnitsCollection', enemies: 'gs.UnitsCollection') -> 'gs.Card':
+        """Get the card at the given index of `get_playable_cards`, without building the list."""
+        for card, count in zip(CARDS, self.counts):
+            if count > 0 and card.is_playable(units, enemies):
+                if index < count:
+                    return card
+                index -= count
+        raise IndexError("card index out of range")
+
+    def get_playable_count(self, units: 'gs.UnitsCollection', enemies: 'gs.UnitsCollection') -> int:
+        """Get the number of cards that can be played, counting every copy."""
+        return sum(count for card, count in zip(CARDS, self.counts) if count > 0 and card.is_playable(units, enemies))
+
+    def get_card_count(self, card: 'gs.Card') -> int:
+        """Get the number of copies of the card in the collection."""
+        return self.counts[card.value.value]
+
+    def get_number_cards(self) -> int:
         """Get the number of cards in the collection."""
-        return len(self.cards)
-    
+        return self.size
+
+    def get_hash(self) -> int:
+        """Get the Zobrist hash of the cards."""
+        return self.hash
+
     def get_playable_cards(self, units: 'gs.UnitsCollection', enemies: 'gs.UnitsCollection') -> List['gs.Card']:
         """Get all cards that can be played."""
-        return [card for card in self.cards if card.is_playable(units, enemies)]
-    
+        return [card for card in self.get_cards() if card.is_playable(units, enemies)]
+
     def get_unit_cards(self) -> List['gs.Card']:
         """Get all unit cards."""
-        return [card for card in self.cards if card.get_value().is_unit_value()]
+        return [card for card in self.get_cards() if card.get_value().is_unit_value()]
 # endregion
 
 # region Helpers
+    def has_card(self, card: 'gs.Card') -> bool:
+        """Check if the collection holds a copy of the card."""
+        return self.counts[card.value.value] > 0
+
     def is_empty(self) -> bool:
         """Check if the collection is empty."""
-        return len(self.cards) == 0
+        return self.size == 0
 # endregion
 
 # region Override
     def __str__(self) -> str:
         """Get a string representation of the collection."""
-        cards_srt = ", ".join([str(card) for card in self.cards])
+        cards_srt = ", ".join([str(card) for card in self.get_cards()])
         return f"CardCollection(cards={cards_srt})"
-# endregion
\ No newline at end of file
+# endregion
@@ -18,25 +18,31 @@ class CardValue(Enum):
 
     def is_unit_value(self) -> bool:
         """Return True if the card value is a unit value."""
-        return self.value < 6
+        return self._is_unit
 
     def is_spell_value(self) -> bool:
         """Return True if the card value is a spell value."""
-        return self.value == 6
+        return self._is_spell
 
     def is_item_value(self) -> bool:
         """Return True if the card value is an item value."""
-        return self.value > 6 and self.value < 12
+        return self._is_item
 
     def is_crystal_value(self) -> bool:
         """Return True if the card value is a crystal value."""
-        return self.value == 12
+        return self._is_crystal
 
     def get_card_type(self) -> 'gs.CardType':
         """Return the card type of the card value."""
-        if self.is_unit_value():
-            return gs.CardType.UNIT
-        if self.is_spell_value():
-            return gs.CardType.SPELL
-        if self.is_item_value():
-            return gs.CardType.ITEM
\ No newline at end of file
+        return self._card_type
+
+
+# Card value metadata is derived once per member instead of on every call
+for _card_value in CardValue:
+    _card_value._is_unit = _card_value.value < 6
+    _card_value._is_spell = _card_value.value == 6
+    _card_value._is_item = _card_value.value > 6 and _card_value.value < 12
+    _card_value._is_crystal = _card_value.value == 12
+    _card_value._card_type = gs.CardType.UNIT if _card_value._is_unit else gs.CardType.SPELL if _card_value._is_spell \
+        else gs.CardType.ITEM if _card_value._is_item else None
+del _card_value
@@ -0,0 +1,52 @@
+from typing import List, Tuple
+import game_structure as gs
+
+class Deck:
+    """Shuffled cards that are only drawn from the front.
+
+    The cards are an immutable tuple shared by every clone, so cloning and drawing only touch the draw index."""
+    __slots__ = ('cards', 'index')
+
+    def __init__(self, cards: Tuple['gs.Card', ...], index: int = 0) -> None:
+        self.cards = cards
+        self.index = index      # position of the next card to draw
+
+# region Methods
+    def clone(self) -> 'Deck':
+        """Create new deck sharing the cards, with the same draw index."""
+        return Deck(self.cards, self.index)
+# endregion
+
+# region Getters
+    def get_cards(self) -> Tuple['gs.Card', ...]:
+        """Get the cards left to draw."""
+        return self.cards[self.index:]
+
+    def get_first_card(self) -> 'gs.Card':
+        """Draw the first card of the deck."""
+        if self.index >= len(self.cards):
+            return None
+        self.index += 1
+        return self.cards[self.index - 1]
+
+    def get_number_cards(self) -> int:
+        """Get the number of cards left to draw."""
+        return len(self.cards) - self.index
+
+    def get_unit_cards(self) -> List['gs.Card']:
+        """Get all unit cards left to draw."""
+        return [card for card in self.get_cards() if card.get_value().is_unit_value()]
+# endregion
+
+# region Helpers
+    def is_empty(self) -> bool:
+        """Check if there are no cards left to draw."""
+        return self.index >= len(self.cards)
+# endregion
+
+# region Override
+    def __str__(self) -> str:
+        """Get a string representation of the deck."""
+        cards_srt = ", ".join([str(card) for card in self.get_cards()])
+        return f"Deck(cards={cards_srt})"
+# endregion
@@ -56,6 +56,9 @@ class Game:
 
             self.game_state.game_parameters.forward_model.on_turn_ended(self.game_state)
 
+        for player in players:
+            player.close()
+
         if self.save_file is not None:
             self.save_file.write(save_str)
             self.save_file.close()
@@ -1,3 +1,4 @@
+import game_structure as gs
 import game_structure.rules as rl
 
 class GameParameters:
@@ -18,6 +19,13 @@ class GameParameters:
         self.attack_positions = [(2, 2)]
         self.speed_positions = [(0, 0), (4, 0)]
         self.forward_model = forward_model
+        self.geometry: 'gs.BoardGeometry' = None
+
+    def get_geometry(self) -> 'gs.BoardGeometry':
+        """Return the movement and range tables of the board, rebuilt only when the board size changes."""
+        if self.geometry is None or self.geometry.board_size != self.board_size:
+            self.geometry = gs.BoardGeometry(self.board_size)
+        return self.geometry
 
     def __str__(self) -> str:
         return (
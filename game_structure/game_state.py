@@ -1,6 +1,7 @@
 from typing import Dict, List, Tuple
 from util.create_unit import create
 import game_structure as gs
+import util.zobrist as zobrist
 import random
 
 class GameState:
@@ -13,8 +14,8 @@ class GameState:
         self.player_1_score = 0
         self.action_points_left = 0
         self.board = self.initiliaze_board_dict()
-        self.player_0_deck: 'gs.CardCollection' = self.initiliaze_deck()
-        self.player_1_deck: 'gs.CardCollection' = self.initiliaze_deck()
+        self.player_0_deck: 'gs.Deck' = self.initiliaze_deck()
+        self.player_1_deck: 'gs.Deck' = self.initiliaze_deck()
         self.player_0_cards: 'gs.CardCollection' = self.initiliaze_cards(self.player_0_deck)
         self.player_1_cards: 'gs.CardCollection' = self.initiliaze_cards(self.player_1_deck)
         self.player_0_units: 'gs.UnitsCollection' = self.initiliaze_units()
@@ -38,6 +39,15 @@ class GameState:
         self.player_1_cards: 'gs.CardCollection' = self.initiliaze_cards(self.player_1_deck)
         self.player_0_units = self.initiliaze_units()
         self.player_1_units = self.initiliaze_units(False)
+
+    def state_hash(self) -> int:
+        """Return the Zobrist hash of the units, hands, current turn and action points left."""
+        return zobrist.state_key(
+            self.player_0_units.get_hash() ^ self.player_0_cards.get_hash(),
+            self.player_1_units.get_hash() ^ self.player_1_cards.get_hash(),
+            self.current_turn,
+            self.action_points_left
+        )
 #endregion
 
 #region Helpers
@@ -53,30 +63,26 @@ class GameState:
             board[(speed[0], board_size[1] - speed[1] - 1)] = gs.TileType.SPEED
         return board
 
-    def initiliaze_cards(self, deck: 'gs.CardCollection') -> 'gs.CardCollection':
+    def initiliaze_cards(self, deck: 'gs.Deck') -> 'gs.CardCollection':
         """Initialize the cards of the game."""
         cards = gs.CardCollection()
         for _ in range(self.game_parameters.cards_on_hand):
             cards.add_card(deck.get_first_card())
         return cards
 
-    def initiliaze_deck(self) -> 'gs.CardCollection':
+    def initiliaze_deck(self) -> 'gs.Deck':
         """Initialize the deck of the game."""
-        deck = gs.CardCollection()
+        cards = []
         for value in gs.CardValue:
             if value is not gs.CardValue.CRYSTAL:
-                deck.add_card(gs.Card(value, value.get_card_type()))
-                deck.add_card(gs.Card(value, value.get_card_type()))
-                deck.add_card(gs.Card(value, value.get_card_type()))
-                if value.is_spell_value() or value.is_item_value():
-                    deck.add_card(gs.Card(value, value.get_card_type()))
-                    deck.add_card(gs.Card(value, value.get_card_type()))
-        random.shuffle(deck.cards)
-        return deck
+                card = gs.Card(value, value.get_card_type())
+                cards.extend([card] * (5 if value.is_spell_value() or value.is_item_value() else 3))
+        random.shuffle(cards)
+        return gs.Deck(tuple(cards))
 
     def initiliaze_units(self, player_1 = True) -> 'gs.UnitsCollection':
         """Initialize the units of the game."""
-        units = gs.UnitsCollection()
+        units = gs.UnitsCollection(0 if player_1 else 1)    # `player_1` is True for the collection of the first player
         for crystal in self.game_parameters.crystal_positions:
             position = (crystal[0], crystal[1]) if player_1 else (crystal[0], self.game_parameters.board_size[1] - crystal[1] - 1)
             card = gs.Card(gs.CardValue.CRYSTAL, gs.CardType.UNIT)
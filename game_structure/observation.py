@@ -1,8 +1,16 @@
-from typing import List, Tuple
-from copy import deepcopy
+from typing import Iterator, List, Tuple, Union
 import game_structure as gs
+import util.sampling as sampling
+import util.zobrist as zobrist
 import random
 
+# Kinds of action a unit can take, as the flags `get_random_action` finds for a unit
+KIND_MOVE = 1
+KIND_ATTACK = 2
+KIND_HEAL = 4
+# Kinds set in every combination of flags, in the order they are drawn from
+KINDS = tuple(tuple(kind for kind in (KIND_MOVE, KIND_ATTACK, KIND_HEAL) if flags & kind) for flags in range(8))
+
 class Observation:
     def __init__(self, game_state: 'gs.GameState', randomise_hidden_info: bool = False):
         if game_state is not None:
@@ -21,17 +29,28 @@ class Observation:
             self.randomise_hidden_info = randomise_hidden_info
 
 # region Methods
-    def clone(self) -> 'gs.Observation':
-        """Clone the observation."""
+    def clone(self, copy_on_write: bool = False) -> 'gs.Observation':
+        """Clone the observation.
+
+        With `copy_on_write` the board, hands and units are shared with this observation, and `SimpleForwardModel` copies
+        a collection, and then each unit, the first time it changes them in either of the two. Records of `apply` taken
+        before such a clone must not be undone after it."""
         new_observation = Observation(None)
         new_observation.game_parameters = self.game_parameters
         new_observation.current_turn = self.current_turn
         new_observation.action_points_left = self.action_points_left
-        new_observation.board = self.board.copy()
         new_observation.player_0_score = self.player_0_score
         new_observation.player_1_score = self.player_1_score
         new_observation.player_0_deck = self.player_0_deck.clone()
         new_observation.player_1_deck = self.player_1_deck.clone()
+        if copy_on_write:
+            new_observation.board = self.board
+            new_observation.player_0_cards = self.player_0_cards.share()
+            new_observation.player_1_cards = self.player_1_cards.share()
+            new_observation.player_0_units = self.player_0_units.share()
+            new_observation.player_1_units = self.player_1_units.share()
+            return new_observation
+        new_observation.board = self.board.copy()
         new_observation.player_0_cards = self.player_0_cards.clone()
         new_observation.player_1_cards = self.player_1_cards.clone()
         new_observation.player_0_units = self.player_0_units.clone()
@@ -58,26 +77,27 @@ class Observation:
         units = self.player_0_units if self.current_turn == 0 else self.player_1_units
         enemy_units = self.player_1_units if self.current_turn == 0 else self.player_0_units
         cards = self.player_0_cards if self.current_turn == 0 else self.player_1_cards
+        geometry = self.game_parameters.get_geometry()
 
-        if action is None and (len(units.get_available_units()) > 0 or len(enemy_units.get_available_units()) > 0):
+        if action is None and (units.get_units_alive() > 0 or enemy_units.get_units_alive() > 0):
             return True
         if action.get_subject() is None:
             return False
 
         if type(action.get_subject()) is gs.Unit:
-            unit = action.get_subject()
-            if unit not in units.get_available_units():
+            unit = units.get_unit_by_id(action.get_subject().uid)
+            if unit is None or not unit.get_card().get_value().is_unit_value():
                 return False
             if action.get_unit() is None:
                 # Unit is moving
-                units_positions = units.get_unit_positions()
-                units_positions.extend(enemy_units.get_unit_positions())
-                return action.get_position() in unit.possible_moves(self.game_parameters.board_size, self.board[unit.get_pos()] == gs.TileType.SPEED, units_positions)
+                units_positions = units.get_occupancy(enemy_units)
+                return unit.can_move_to(action.get_position(), geometry, self.board[unit.get_pos()] == gs.TileType.SPEED, units_positions)
             else:
                 # Unit is attacking or healing
-                return action.get_unit() in units.get_units_in_range(unit) or action.get_unit() in enemy_units.get_units_in_range(unit)
+                target = units.get_unit_by_id(action.get_unit().uid) or enemy_units.get_unit_by_id(action.get_unit().uid)
+                return target is not None and target.get_pos() in geometry.get_tiles_in_range(unit.get_pos(), unit.get_range())
         else:
-            if action.get_subject() not in cards.get_cards():
+            if not cards.has_card(action.get_subject()):
                 return False
             if action.get_unit() is None and action.get_position() is None:
                 return True
@@ -87,113 +107,174 @@ class Observation:
                 # Inferno spell or heal potion is used or unit is summoned
                 if action.get_subject().get_value().is_spell_value():
                     enemy_units = self.player_1_units if self.current_turn == 0 else self.player_0_units
-                    return action.get_position() in enemy_units.get_unit_positions()
+                    return enemy_units.get_unit_in_position(action.get_position()) is not None
                 elif action.get_subject().get_value().is_item_value():
                     units = self.player_0_units if self.current_turn == 0 else self.player_1_units
-                    return action.get_position() in units.get_unit_positions()
+                    return units.get_unit_in_position(action.get_position()) is not None
                 else:
                     units = self.player_0_units if self.current_turn == 0 else self.player_1_units
                     enemy_units = self.player_1_units if self.current_turn == 0 else self.player_0_units
                     player_1 = True if self.current_turn == 1 else False
-                    return action.get_position() in units.get_avalible_positions_for_spawn(player_1, self.game_parameters.board_size) \
-                        and action.get_position() not in enemy_units.get_unit_positions()
+                    return units.is_avalible_position_for_spawn(action.get_position(), player_1, self.game_parameters.board_size, enemy_units.get_occupancy())
             else:
                 # Equipment given to unit
                 units = self.player_0_units if self.current_turn == 0 else self.player_1_units
-                return units.get_unit_in_position(action.get_unit().get_pos()) is not None
+                return units.get_unit_by_id(action.get_unit().uid) is not None
 
 # endregion
 
 # region Getters
     def get_actions(self) -> List['gs.Action']:
         """Get all the possible actions for the current player."""
-        actions = []
+        return list(self.iter_actions())
+
+    def iter_actions(self) -> Iterator['gs.Action']:
+        """Yield the actions of `get_actions` one by one, building each only when it is reached."""
+        for subject, targets, on_units in self.get_action_groups():
+            for target in targets:
+                yield gs.Action(subject, target, None) if on_units else gs.Action(subject, None, target)
+
+    def count_actions(self) -> int:
+        """Get the number of actions of `get_actions` without building them."""
+        return sum(len(targets) for _, targets, _ in self.get_action_groups())
+
+    def action_at(self, index: int) -> 'gs.Action':
+        """Get the action at the given index of `get_actions`, building only that one.
+
+        The actions are enumerated again on every call, to visit many of them decode the `get_action_indices` instead."""
+        for subject, targets, on_units in self.get_action_groups():
+            if index < len(targets):
+                return gs.Action(subject, targets[index], None) if on_units else gs.Action(subject, None, targets[index])
+            index -= len(targets)
+        raise IndexError("action index out of range")
+
+    def get_action_groups(self) -> Iterator[Tuple[Union['gs.Unit', 'gs.Card'], List, bool]]:
+        """Yield the actions of the current player grouped by subject, as `(subject, targets, on_units)`.
+
+        Targets are units if `on_units` is True and positions otherwise, with None for playing a card without target."""
         units = self.player_0_units if self.current_turn == 0 else self.player_1_units
         cards = self.player_0_cards if self.current_turn == 0 else self.player_1_cards
         enemy_units = self.player_1_units if self.current_turn == 0 else self.player_0_units
-        units_positions = units.get_unit_positions()
-        units_positions.extend(enemy_units.get_unit_positions())
+        units_positions = units.get_occupancy(enemy_units)
+        geometry = self.game_parameters.get_geometry()
 
         for unit in units.get_available_units():
             if unit.get_card().get_value() == gs.CardValue.CLERIC:
-                for target in units.get_units_in_range(unit):
-                    actions.append(gs.Action(unit.clone(), target.clone(), None))
-            for enemy in enemy_units.get_units_in_range(unit):
-                actions.append(gs.Action(unit.clone(), enemy.clone(), None))
-            for position in unit.possible_moves(self.game_parameters.board_size, self.board[unit.get_pos()] == gs.TileType.SPEED, units_positions):
-                actions.append(gs.Action(unit.clone(), None, deepcopy(position)))
-
-        for card in cards.get_cards():
+                yield unit, units.get_units_in_range(unit, geometry), True
+            yield unit, enemy_units.get_units_in_range(unit, geometry), True
+            yield unit, unit.possible_moves(geometry, self.board[unit.get_pos()] == gs.TileType.SPEED, units_positions), False
+
+        for card in cards.get_unique_cards():
             if not card.is_playable(units, enemy_units):
-                actions.append(gs.Action(card.clone(), None, None))
+                yield card, [None], False
             elif card.get_value().is_spell_value():
-                for enemy in enemy_units.get_units():
-                    actions.append(gs.Action(card.clone(), None, deepcopy(enemy.get_pos())))
+                yield card, [enemy.get_pos() for enemy in enemy_units.get_units()], False
             elif card.get_value().is_item_value() and card.get_value() == gs.CardValue.HEAL_POTION:
-                for unit in units.get_available_units():
-                    actions.append(gs.Action(card.clone(), None, deepcopy(unit.get_pos())))
+                yield card, [unit.get_pos() for unit in units.get_available_units()], False
             elif card.get_value().is_item_value() and not card.get_value() == gs.CardValue.HEAL_POTION:
-                for unit in units.get_available_units():
-                    actions.append(gs.Action(card.clone(), unit.clone(), None))
+                yield card, units.get_available_units(), True
             else:
                 player_1 = True if self.current_turn == 1 else False
-                spawns = units.get_avalible_positions_for_spawn(player_1, self.game_parameters.board_size, enemy_units.get_unit_positions())
-                for position in spawns:
-                    actions.append(gs.Action(card.clone(), None, deepcopy(position)))
-        return actions
-    
+                yield card, units.get_avalible_positions_for_spawn(player_1, self.game_parameters.board_size, enemy_units.get_occupancy()), False
+
     def get_random_action(self) -> 'gs.Action':
-        """Gets a random action that is currently valid."""
+        """Gets a random action that is currently valid.
+
+        Units and targets are drawn at random until a valid one is found, see `sampling.choice`, so no candidate
+        list is built. The coin between units and cards is tossed before looking for a playable unit, and falls
+        back to the cards if there is none, which keeps the distribution of listing the playable units first."""
         units = self.player_0_units if self.current_turn == 0 else self.player_1_units
         cards = self.player_0_cards if self.current_turn == 0 else self.player_1_cards
         enemy_units = self.player_1_units if self.current_turn == 0 else self.player_0_units
-        
-        # Check possibilities for a unit to use it
-        playable_units = units.get_playable_units(units, enemy_units, self.game_parameters.board_size, self.board)
-        use_unit = len(playable_units) > 0
-        use_card = len(cards.get_cards()) > 0
+        geometry = self.game_parameters.get_geometry()
+        positions = units.get_occupancy(enemy_units)
 
-        if not use_unit and not use_card:
+        unit = None
+        if cards.is_empty() or not random.getrandbits(1):
+            # Play with a unit, checking each kind of action once for the units drawn
+            unit, kinds = sampling.choice(units.get_units(), lambda unit: self.get_unit_kinds(unit, units, enemy_units, positions))
+        if unit is not None:
+            action = random.choice(KINDS[kinds])
+            if action == KIND_MOVE:
+                speed = unit.archetype.speed + 1 if self.board[unit.get_pos()] == gs.TileType.SPEED else unit.archetype.speed
+                return gs.Action(unit, None, sampling.choice(geometry.get_moves(unit.get_pos(), speed), lambda pos: pos not in positions)[0])
+            tiles = geometry.get_tiles_in_range(unit.get_pos(), unit.archetype.range)
+            targets = enemy_units if action == KIND_ATTACK else units
+            return gs.Action(unit, sampling.choice(targets.get_units(), lambda target: target.get_pos() in tiles)[0], None)
+        if cards.is_empty():
             return None
-        
-        if use_unit and use_card:
-            use_unit = bool(random.getrandbits(1))
-
-        if use_unit:
-            # Play with a unit
-            option = random.choice(playable_units)
-            possible_actions = []
-            if len(option[1]) > 0:
-                possible_actions.append('move')
-            if option[2]:
-                possible_actions.append('attack')
-            if option[3]:
-                possible_actions.append('heal')
-
-            action = random.choice(possible_actions)
-            if action == 'move':
-                return gs.Action(option[0].clone(), None, deepcopy(random.choice(option[1])))
-            elif action == 'attack':
-                return gs.Action(option[0].clone(), random.choice(enemy_units.get_units_in_range(option[0].clone())).clone(), None)
-            else:
-                return gs.Action(option[0].clone(), random.choice(units.get_units_in_range(option[0].clone())).clone(), None)
+
+        # Play with a card, drawing an index over every copy like `random.choice` on the card lists
+        playable_count = cards.get_playable_count(units, enemy_units)
+        if playable_count == 0:
+            return gs.Action(cards.get_card_at(random.randrange(cards.get_number_cards())), None, None)
+        card = cards.get_playable_card_at(random.randrange(playable_count), units, enemy_units)
+
+        if card.get_value().is_spell_value():
+            return gs.Action(card, None, random.choice(enemy_units.get_units()).get_pos())
+        elif card.get_value().is_item_value():
+            target = sampling.choice(units.get_units(), lambda unit: unit.get_card().get_value().is_unit_value())[0]
+            return gs.Action(card, None, target.get_pos()) if card.get_value() == gs.CardValue.HEAL_POTION else gs.Action(card, target, None)
         else:
-            # Play with a card
-            avaliable_cards = cards.get_playable_cards(units, enemy_units)
-            if len(avaliable_cards) == 0:
-                return gs.Action(random.choice(cards.get_cards()).clone(), None, None)
-            card = random.choice(avaliable_cards)
-            
-            if card.get_value().is_spell_value():
-                return gs.Action(card.clone(), None, deepcopy(random.choice(enemy_units.get_units()).clone().get_pos()))
-            elif card.get_value().is_item_value() and card.get_value() == gs.CardValue.HEAL_POTION:
-                return gs.Action(card.clone(), None, deepcopy(random.choice(units.get_available_units()).clone().get_pos()))
-            elif card.get_value().is_item_value() and not card.get_value() == gs.CardValue.HEAL_POTION:
-                return gs.Action(card.clone(), random.choice(units.get_available_units()).clone(), None)
-            else:
-                player_1 = True if self.current_turn == 1 else False
-                spawns = units.get_avalible_positions_for_spawn(player_1, self.game_parameters.board_size, enemy_units.get_unit_positions())
-                return gs.Action(card.clone(), None, deepcopy(random.choice(spawns)))
+            position = sampling.choice(geometry.get_spawn_positions(self.current_turn), lambda pos: pos not in positions)[0]
+            if position is None:
+                raise IndexError("no free position to summon the unit")
+            return gs.Action(card, None, position)
+
+    def get_unit_kinds(self, unit: 'gs.Unit', units: 'gs.UnitsCollection', enemy_units: 'gs.UnitsCollection', positions: 'gs.BoardOccupancy') -> int:
+        """Get the flags of the kinds of action the unit can take, 0 for crystals and units that cannot act."""
+        if not unit.get_card().get_value().is_unit_value():
+            return 0
+        geometry = self.game_parameters.get_geometry()
+        return (KIND_MOVE if unit.can_move(geometry, self.board[unit.get_pos()] == gs.TileType.SPEED, positions) else 0) \
+            | (KIND_ATTACK if unit.can_attack(enemy_units, geometry) else 0) | (KIND_HEAL if unit.can_heal(units, geometry) else 0)
+
+    def get_action(self, key: Tuple) -> 'gs.Action':
+        """Rebuild the action of the current player with the given `Action.get_key()`."""
+        units = self.player_0_units if self.current_turn == 0 else self.player_1_units
+        enemy_units = self.player_1_units if self.current_turn == 0 else self.player_0_units
+        subject, target, position = key
+        if type(subject) is int:
+            value = gs.CardValue(subject)
+            subject = gs.Card(value, value.get_card_type())
+        else:
+            subject = units.get_unit_in_position(subject)
+        if target is not None:
+            target = units.get_unit_in_position(target) or enemy_units.get_unit_in_position(target)
+        return gs.Action(subject, target, position)
+
+    def get_action_indices(self) -> List[int]:
+        """Return the encoded actions of `get_actions`, or the pass action if there is none, without building `Action` objects."""
+        geometry = self.game_parameters.get_geometry()
+        tiles = geometry.tiles
+        indices = []
+        for subject, targets, on_units in self.get_action_groups():
+            base = (tiles + subject.get_value().value - 1 if type(subject) is gs.Card else geometry.get_tile(subject.get_pos())) * (tiles + 1)
+            for target in targets:
+                if target is None:
+                    indices.append(base + tiles)
+                else:
+                    indices.append(base + geometry.get_tile(target.get_pos() if on_units else target))
+        return indices if len(indices) > 0 else [geometry.pass_action]
+
+    def encode_action(self, action: 'gs.Action') -> int:
+        """Return the index of an action in the action space of `BoardGeometry`."""
+        return self.game_parameters.get_geometry().encode_action(action)
+
+    def decode_action(self, index: int) -> 'gs.Action':
+        """Rebuild the action of the current player encoded by `encode_action`."""
+        occupancy = self.player_0_units.get_occupancy(self.player_1_units)
+        key = self.game_parameters.get_geometry().get_action_key(index, lambda pos: pos in occupancy)
+        return self.get_action(key) if key is not None else None
+
+    def state_hash(self) -> int:
+        """Return the Zobrist hash of the units, hands, current turn and action points left."""
+        return zobrist.state_key(
+            self.player_0_units.get_hash() ^ self.player_0_cards.get_hash(),
+            self.player_1_units.get_hash() ^ self.player_1_cards.get_hash(),
+            self.current_turn,
+            self.action_points_left
+        )
 # endregion
 
 #region Override
@@ -1,2 +1,3 @@
+from game_structure.rules.undo_record import UndoRecord
 from game_structure.rules.forward_model import ForwardModel
 from game_structure.rules.simple_forward_model import SimpleForwardModel
\ No newline at end of file
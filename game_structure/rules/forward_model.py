@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Union
 import game_structure as gs
+import game_structure.rules as rl
 
 class ForwardModel(ABC):
     """Abstract class that will define the rules for the game"""
@@ -10,6 +11,16 @@ class ForwardModel(ABC):
         """Executes the action and moves the game to the next state."""
         pass
 
+    @abstractmethod
+    def apply(self, game_state: Union['gs.GameState', 'gs.Observation'], action: 'gs.Action') -> 'rl.UndoRecord':
+        """Executes the action and returns the record needed to undo it."""
+        pass
+
+    @abstractmethod
+    def undo(self, game_state: Union['gs.GameState', 'gs.Observation'], record: 'rl.UndoRecord') -> None:
+        """Reverts an action executed by `apply`. Records must be undone in reverse order."""
+        pass
+
     @abstractmethod
     def on_turn_ended(self, game_state: Union['gs.GameState', 'gs.Observation']) -> None:
         """Moves the game to the next turn."""
@@ -1,39 +1,49 @@
 from typing import Union, Tuple
-from copy import deepcopy
 from util.create_unit import create
 import game_structure as gs
 import game_structure.rules as rl
+import game_structure.array_state as arr
 
 class SimpleForwardModel(rl.ForwardModel):
     def __init__(self):
         super().__init__()
 
 # region Methods
-    def step(self, game_state: Union['gs.GameState', 'gs.Observation'], action: 'gs.Action') -> bool:
-        """Perform an action on the game state."""
+    def step(self, game_state: Union['gs.GameState', 'gs.Observation'], action: 'gs.Action', record: 'rl.UndoRecord' = None) -> bool:
+        """Perform an action on the game state, logging every change in `record` if given."""
+        if type(game_state) is gs.ArrayState:
+            return self.step_array(game_state, action)
         game_state.action_points_left -= 1
 
         if action is None:
             return False
         
-        action_pos = deepcopy(action.get_position()) if action.get_position() is not None else None
-        unit = deepcopy(action.get_unit()) if action.get_unit() is not None else None
+        action_pos = action.get_position()
+        unit = action.get_unit()
+        player = game_state.current_turn
+        enemy = (player + 1) % 2
         
-        cards = game_state.player_0_cards if game_state.current_turn == 0 else game_state.player_1_cards
-        units = game_state.player_0_units if game_state.current_turn == 0 else game_state.player_1_units
-        enemy_units = game_state.player_1_units if game_state.current_turn == 0 else game_state.player_0_units
+        # collections are read here and taken with `get_units`/`get_cards` right before a change, as copy-on-write
+        # clones share them until then
+        units = game_state.player_0_units if player == 0 else game_state.player_1_units
+        enemy_units = game_state.player_1_units if player == 0 else game_state.player_0_units
         #discard = game_state.player_0_discard if game_state.current_turn == 0 else game_state.player_1_discard
 
         if type(action.get_subject()) is gs.Card:
-            card = action.get_subject().clone()
+            card = action.get_subject()
             if unit is None and action_pos is None:
-                cards.remove_card(card)
+                self.remove_card(self.get_cards(game_state, player), card, record)
                 self.update_score(game_state)
                 return True
             elif unit is not None:
-
-                units.get_unit_in_position(deepcopy(unit.get_pos())).get_equipement().append(card)
-                cards.remove_card(card)
+                target = units.get_unit_by_id(unit.uid)
+                if target is None:
+                    return False
+                target = self.get_units(game_state, player).own_unit(target)
+                target.add_equipement(card)
+                if record is not None:
+                    record.add(rl.UndoRecord.EQUIPEMENT, target, card)
+                self.remove_card(self.get_cards(game_state, player), card, record)
                 self.update_score(game_state)
                 return True
             elif action_pos is not None:
@@ -41,50 +51,100 @@ class SimpleForwardModel(rl.ForwardModel):
                     target = enemy_units.get_unit_in_position(action_pos)
                     if target is None:
                         return False
-                    target.set_hp(target.get_hp() - 400)
+                    enemy_units = self.get_units(game_state, enemy)
+                    target = enemy_units.own_unit(target)
+                    self.set_hp(target, target.get_hp() - 400, record)
                     if target.get_hp() <= 0:
-                        enemy_units.remove_unit(target)
+                        self.remove_unit(enemy_units, target, record)
                 elif card.get_value() == gs.CardValue.HEAL_POTION:
                     target = units.get_unit_in_position(action_pos)
                     if target is None:
                         return False
-                    target.set_hp(target.get_hp() + 300)
+                    target = self.get_units(game_state, player).own_unit(target)
+                    self.set_hp(target, target.get_hp() + 300, record)
                 else:
-                    units.add_unit(create(card, action_pos))
-                cards.remove_card(card)
+                    units = self.get_units(game_state, player)
+                    target = create(card, action_pos)
+                    units.add_unit(target)
+                    if record is not None:
+                        record.add(rl.UndoRecord.ADDED_UNIT, units, target)
+                self.remove_card(self.get_cards(game_state, player), card, record)
                 self.update_score(game_state)
                 return True
             else:
                 return False
         else:
-            subject = action.get_subject().clone()
+            subject = units.get_unit_by_id(action.get_subject().uid)
+            if subject is None:
+                return False
             if action_pos is None:
-                if subject.get_card().get_value() == gs.CardValue.CLERIC and unit in units.get_units():
-                    target = units.get_unit_in_position(unit.get_pos())
-                    if target is None:
-                        return False
-                    target.set_hp(target.get_hp() + unit.get_power())
+                # unit ids tell the units of each player apart, so the cleric only heals its own units
+                target = units.get_unit_by_id(unit.uid)
+                if subject.get_card().get_value() == gs.CardValue.CLERIC and target is not None:
+                    target = self.get_units(game_state, player).own_unit(target)
+                    self.set_hp(target, target.get_hp() + target.get_power(), record)
                 else:
-                    target = enemy_units.get_unit_in_position(unit.get_pos())
+                    target = enemy_units.get_unit_by_id(unit.uid)
                     if target is None:
                         return False
+                    enemy_units = self.get_units(game_state, enemy)
+                    target = enemy_units.own_unit(target)
+                    if record is not None:
+                        record.add(rl.UndoRecord.HP, target, target.get_hp())
                     subject.attack_unit(target, game_state.board[subject.get_pos()] == gs.TileType.ATTACK)
                     if target.get_hp() <= 0:
-                        enemy_units.remove_unit(target)
+                        self.remove_unit(enemy_units, target, record)
             else:
-                target = units.get_unit_in_position(subject.get_pos())
-                if target is None:
-                    return False
-                target.set_pos(action_pos)
+                subject = self.get_units(game_state, player).own_unit(subject)
+                if record is not None:
+                    record.add(rl.UndoRecord.POSITION, subject, subject.get_pos())
+                subject.set_pos(action_pos)
 
             self.update_score(game_state)
             return True
 
+    def apply(self, game_state: Union['gs.GameState', 'gs.Observation', 'gs.ArrayState'], action: 'gs.Action') -> 'rl.UndoRecord':
+        """Perform an action on the game state and return the record needed to undo it."""
+        record = rl.UndoRecord(game_state)
+        if type(game_state) is gs.ArrayState:
+            record.data = game_state.data[:]
+        record.result = self.step(game_state, action, record)
+        return record
+
+    def undo(self, game_state: Union['gs.GameState', 'gs.Observation', 'gs.ArrayState'], record: 'rl.UndoRecord') -> None:
+        """Revert an action performed by `apply`, without copying the rest of the state."""
+        if record.data is not None:
+            game_state.data[:] = record.data
+            return
+        for change in reversed(record.changes):
+            kind = change[0]
+            if kind == rl.UndoRecord.HP:
+                change[1].set_hp(change[2])
+            elif kind == rl.UndoRecord.POSITION:
+                change[1].set_pos(change[2])
+            elif kind == rl.UndoRecord.EQUIPEMENT:
+                change[1].remove_equipement(change[2])
+            elif kind == rl.UndoRecord.ADDED_UNIT:
+                change[1].remove_unit(change[2])
+                change[1].next_uid = change[2].uid
+            elif kind == rl.UndoRecord.REMOVED_UNIT:
+                change[1].insert_unit(change[2], change[3])
+            else:
+                change[1].add_card(change[2])
+        game_state.action_points_left = record.action_points_left
+        game_state.player_0_score = record.player_0_score
+        game_state.player_1_score = record.player_1_score
+
     def on_turn_ended(self, game_state: Union['gs.GameState', 'gs.Observation']) -> None:
+        if type(game_state) is gs.ArrayState:
+            return self.on_turn_ended_array(game_state)
         if self.is_turn_finished(game_state):
             player_cards = game_state.player_0_cards if game_state.current_turn == 0 else game_state.player_1_cards
             deck = game_state.player_0_deck if game_state.current_turn == 0 else game_state.player_1_deck
-            for _ in range(game_state.game_parameters.cards_on_hand - player_cards.get_number_cards()):
+            missing = game_state.game_parameters.cards_on_hand - player_cards.get_number_cards()
+            if missing > 0 and not deck.is_empty():
+                player_cards = self.get_cards(game_state, game_state.current_turn)
+            for _ in range(missing):
                 card_add = deck.get_first_card()
                 if card_add is not None:
                     player_cards.add_card(card_add)
@@ -92,6 +152,8 @@ class SimpleForwardModel(rl.ForwardModel):
             game_state.action_points_left = game_state.game_parameters.action_points_per_turn
 
     def is_terminal(self, game_state: Union['gs.GameState', 'gs.Observation']) -> bool:
+        if type(game_state) is gs.ArrayState:
+            return self.is_terminal_array(game_state)
         if self.current_player_cant_play(game_state) and self.next_player_has_units(game_state):
             if game_state.current_turn == 0:
                 game_state.player_1_score += game_state.player_0_score * 2
@@ -106,6 +168,46 @@ class SimpleForwardModel(rl.ForwardModel):
 # endregion
 
 # region Helpers
+    def get_units(self, game_state: Union['gs.GameState', 'gs.Observation'], player: int) -> 'gs.UnitsCollection':
+        """Return the units of the player ready to be changed, copying them first if they are shared by a copy-on-write clone."""
+        units = game_state.player_0_units if player == 0 else game_state.player_1_units
+        if units.shared:
+            units = units.copy()
+            if player == 0:
+                game_state.player_0_units = units
+            else:
+                game_state.player_1_units = units
+        return units
+
+    def get_cards(self, game_state: Union['gs.GameState', 'gs.Observation'], player: int) -> 'gs.CardCollection':
+        """Return the hand of the player ready to be changed, copying it first if it is shared by a copy-on-write clone."""
+        cards = game_state.player_0_cards if player == 0 else game_state.player_1_cards
+        if cards.shared:
+            cards = cards.clone()
+            if player == 0:
+                game_state.player_0_cards = cards
+            else:
+                game_state.player_1_cards = cards
+        return cards
+
+    def set_hp(self, unit: 'gs.Unit', hp: int, record: 'rl.UndoRecord' = None) -> None:
+        """Set unit hp, logging the previous value in `record` if given."""
+        if record is not None:
+            record.add(rl.UndoRecord.HP, unit, unit.get_hp())
+        unit.set_hp(hp)
+
+    def remove_unit(self, units: 'gs.UnitsCollection', unit: 'gs.Unit', record: 'rl.UndoRecord' = None) -> None:
+        """Remove a unit from its collection, logging it in `record` if given."""
+        index = units.remove_unit(unit)
+        if record is not None:
+            record.add(rl.UndoRecord.REMOVED_UNIT, units, index, unit)
+
+    def remove_card(self, cards: 'gs.CardCollection', card: 'gs.Card', record: 'rl.UndoRecord' = None) -> None:
+        """Remove a card from a hand, logging it in `record` if given."""
+        cards.remove_card(card)
+        if record is not None:
+            record.add(rl.UndoRecord.REMOVED_CARD, cards, card)
+
     def current_player_cant_play(self, game_state: Union['gs.GameState', 'gs.Observation']) -> bool:
         """Return if the player can't play."""
         current_units = game_state.player_0_units if game_state.current_turn == 0 else game_state.player_1_units
@@ -114,35 +216,148 @@ class SimpleForwardModel(rl.ForwardModel):
         return current_units.get_units_alive() == 0 and current_cards.is_empty()
     
     def next_player_has_units(self, game_state: Union['gs.GameState', 'gs.Observation']) -> bool:
-        """Return if the player can't play."""
+        """Return if the next player has units on the board, in hand or in the deck."""
         next_units = game_state.player_1_units if game_state.current_turn == 0 else game_state.player_0_units
         next_cards = game_state.player_1_cards if game_state.current_turn == 0 else game_state.player_0_cards
         next_deck = game_state.player_1_deck if game_state.current_turn == 0 else game_state.player_0_deck
 
-        return next_units.get_units_alive() > 0 or next_cards.get_unit_cards() > 0 or next_deck.get_unit_cards() > 0
+        return next_units.get_units_alive() > 0 or len(next_cards.get_unit_cards()) > 0 or len(next_deck.get_unit_cards()) > 0
 
     def update_score(self, game_state: Union['gs.GameState', 'gs.Observation']) -> None:
-        """Update score."""
+        """Update score from the running aggregates of the units collections."""
+        units = game_state.player_0_units if game_state.current_turn == 0 else game_state.player_1_units
+        enemy_units = game_state.player_1_units if game_state.current_turn == 0 else game_state.player_0_units
+        score = max((int((units.get_crystals_hp() - enemy_units.get_crystals_hp()) / 100)), 0)
+        score += max((int((units.get_attack() - enemy_units.get_attack()) / 10)), 0)
+        #playable_cards = cards.get_playable_cards(units)
+        #score += (game_state.game_parameters.cards_on_hand - len(playable_cards)) * 10
+        score += max((units.get_units_alive() - enemy_units.get_units_alive()), 0) * 10
         if game_state.current_turn == 0:
-            current_hp = sum(map(lambda unit: unit.get_hp(), game_state.player_0_units.get_crystals()))
-            enemy_hp = sum(map(lambda unit: unit.get_hp(), game_state.player_1_units.get_crystals()))
-            score = max((int((current_hp - enemy_hp) / 100)), 0)
-            current_attack = sum(map(lambda unit: unit.get_bonus_attack(), game_state.player_0_units.get_units()))
-            enemy_attack = sum(map(lambda unit: unit.get_bonus_attack(), game_state.player_1_units.get_units()))
-            score += max((int((current_attack - enemy_attack) / 10)), 0)
-            #playable_cards = game_state.player_0_cards.get_playable_cards(game_state.player_0_units)
-            #score += (game_state.game_parameters.cards_on_hand - len(playable_cards)) * 10
-            score += max((game_state.player_0_units.get_units_alive() - game_state.player_1_units.get_units_alive()), 0) * 10
             game_state.player_0_score += score
         else:
-            current_hp = sum(map(lambda unit: unit.get_hp(), game_state.player_1_units.get_crystals()))
-            enemy_hp = sum(map(lambda unit: unit.get_hp(), game_state.player_0_units.get_crystals()))
-            score = max((int((current_hp - enemy_hp) / 100)), 0)
-            current_attack = sum(map(lambda unit: unit.get_bonus_attack(), game_state.player_1_units.get_units()))
-            enemy_attack = sum(map(lambda unit: unit.get_bonus_attack(), game_state.player_0_units.get_units()))
-            score += max((int((current_attack - enemy_attack) / 10)), 0)
-            #playable_cards = game_state.player_1_cards.get_playable_cards(game_state.player_1_units)
-            #score += (game_state.game_parameters.cards_on_hand - len(playable_cards)) * 10
-            score += max((game_state.player_1_units.get_units_alive() - game_state.player_0_units.get_units_alive()), 0) * 10
             game_state.player_1_score += score
-# endregion    
\ No newline at end of file
+# endregion
+
+# region Array state
+    def step_array(self, state: 'gs.ArrayState', action: 'gs.Action') -> bool:
+        """Perform an action on an `ArrayState`, with the same rules as `step`."""
+        state.action_points_left -= 1
+
+        if action is None:
+            return False
+
+        player = state.current_turn
+        enemy = 1 - player
+        layout = state.layout
+        action_tile = layout.get_tile(action.get_position()) if action.get_position() is not None else None
+
+        # units are found by `Unit.uid` like in `step`, the tile of the handle is only a hint
+        if type(action.get_subject()) is gs.Card:
+            value = action.get_subject().get_value()
+            if action.get_unit() is not None:
+                target = state.find_unit_slot(player, action.get_unit())
+                if target < 0:
+                    return False
+                if value in arr.EQUIPEMENT_VALUES:
+                    state.add_equipement(player, target, value.value)
+            elif action_tile is not None:
+                if value.is_spell_value():
+                    target = state.get_unit_slot(enemy, action_tile)
+                    if target < 0:
+                        return False
+                    self.damage_array(state, enemy, target, 400)
+                elif value == gs.CardValue.HEAL_POTION:
+                    target = state.get_unit_slot(player, action_tile)
+                    if target < 0:
+                        return False
+                    base = state.get_unit_base(player, target)
+                    state.set_hp(player, target, state.data[base + arr.U_HP] + 300)
+                else:
+                    state.add_unit(player, value.value, action_tile)
+            state.remove_card(player, value.value)
+            self.update_score_array(state)
+            return True
+        else:
+            slot = state.find_unit_slot(player, action.get_subject())
+            if slot < 0:
+                return False
+            if action_tile is None:
+                target = state.find_unit_slot(player, action.get_unit())
+                if state.get_unit_value(player, slot) == arr.CLERIC and target >= 0:
+                    base = state.get_unit_base(player, target)
+                    state.set_hp(player, target, state.data[base + arr.U_HP] + layout.stats[state.data[base + arr.U_VALUE]][arr.POWER])
+                else:
+                    target = state.find_unit_slot(enemy, action.get_unit())
+                    if target < 0:
+                        return False
+                    base = state.get_unit_base(player, slot)
+                    is_on_attack_tile = layout.attack_tiles[state.data[base + arr.U_TILE]]
+                    power = layout.stats[state.data[base + arr.U_VALUE]][arr.POWER]
+                    res = layout.stats[state.get_unit_value(enemy, target)][arr.RESISTANCE]
+                    self.damage_array(state, enemy, target, gs.Unit.get_damage(power, self.get_bonus_attack_array(state, player, slot), is_on_attack_tile, res))
+            else:
+                state.move_unit(player, slot, action_tile)
+
+            self.update_score_array(state)
+            return True
+
+    def on_turn_ended_array(self, state: 'gs.ArrayState') -> None:
+        """Move an `ArrayState` to the next turn, refilling the hand of the current player."""
+        if self.is_turn_finished(state):
+            player = state.current_turn
+            for _ in range(state.game_parameters.cards_on_hand - state.get_hand_size(player)):
+                value = state.draw_card(player)
+                if value != 0:
+                    state.add_card(player, value)
+            state.current_turn = (player + 1) % 2
+            state.action_points_left = state.game_parameters.action_points_per_turn
+
+    def is_terminal_array(self, state: 'gs.ArrayState') -> bool:
+        """Check if the game in an `ArrayState` is ended, with the same side effects as `is_terminal`."""
+        player = state.current_turn
+        enemy = 1 - player
+        cant_play = state.get_available_count(player) == 0 and state.get_hand_size(player) == 0
+        if cant_play and self.next_player_has_units_array(state):
+            state.data[arr.SCORE + enemy] += state.data[arr.SCORE + player] * 2
+        return self.get_crystals_hp_array(state, 0) is None or self.get_crystals_hp_array(state, 1) is None or cant_play
+
+    def next_player_has_units_array(self, state: 'gs.ArrayState') -> bool:
+        """Return if the next player has units on the board, in hand or in the deck."""
+        enemy = 1 - state.current_turn
+        deck = state.decks[enemy][state.data[arr.DRAW + enemy]:]
+        return state.get_available_count(enemy) > 0 or any(arr.CARD_VALUES[value].is_unit_value() for value in state.get_hand(enemy)) \
+            or any(arr.CARD_VALUES[value].is_unit_value() for value in deck)
+
+    def damage_array(self, state: 'gs.ArrayState', player: int, slot: int, damage: int) -> None:
+        """Subtract hp from a unit, removing it when it dies."""
+        base = state.get_unit_base(player, slot)
+        state.set_hp(player, slot, state.data[base + arr.U_HP] - damage)
+        if state.data[base + arr.U_HP] <= 0:
+            state.remove_unit(player, slot)
+
+    def get_bonus_attack_array(self, state: 'gs.ArrayState', player: int, slot: int, is_on_attack_tile: bool = False) -> float:
+        """Mirror of `Unit.get_bonus_attack`, whose equipement filter never matches, so equipement is not counted."""
+        value = state.get_unit_value(player, slot)
+        power = state.layout.stats[value][arr.POWER]
+        dmg = power
+        if value == arr.CLERIC:
+            dmg = 0.5 * power
+        if is_on_attack_tile:
+            dmg += 0.15 * power
+        return dmg
+
+    def get_crystals_hp_array(self, state: 'gs.ArrayState', player: int) -> int:
+        """Return the total hp of the crystals alive of the player, or None if there is none."""
+        hp = state.data[arr.CRYSTALS_HP + player]
+        return hp if hp > 0 else None
+
+    def update_score_array(self, state: 'gs.ArrayState') -> None:
+        """Update score of an `ArrayState`, with the same formula as `update_score`."""
+        data = state.data
+        player = state.current_turn
+        enemy = 1 - player
+        score = max((int((data[arr.CRYSTALS_HP + player] - data[arr.CRYSTALS_HP + enemy]) / 100)), 0)
+        score += max((int((data[arr.ATTACK + player] - data[arr.ATTACK + enemy]) / 20)), 0)
+        score += max((data[arr.ALIVE + player] - data[arr.ALIVE + enemy]), 0) * 10
+        data[arr.SCORE + player] += score
+# endregion
@@ -0,0 +1,25 @@
+from typing import List, Tuple, Union
+import game_structure as gs
+
+class UndoRecord:
+    """Fields touched by `SimpleForwardModel.apply`, used by `SimpleForwardModel.undo` to restore the state."""
+    HP = 0              # (HP, unit, previous hp)
+    POSITION = 1        # (POSITION, unit, previous position)
+    EQUIPEMENT = 2      # (EQUIPEMENT, unit, card)
+    ADDED_UNIT = 3      # (ADDED_UNIT, collection, unit)
+    REMOVED_UNIT = 4    # (REMOVED_UNIT, collection, index, unit)
+    REMOVED_CARD = 5    # (REMOVED_CARD, collection, card)
+
+    def __init__(self, game_state: Union['gs.GameState', 'gs.Observation', 'gs.ArrayState']) -> None:
+        self.action_points_left = game_state.action_points_left
+        self.player_0_score = game_state.player_0_score
+        self.player_1_score = game_state.player_1_score
+        self.changes: List[Tuple] = []
+        self.data = None        # full buffer of an `ArrayState`, as copying it costs as much as tracking fields
+        self.result = False     # value returned by `step`
+
+# region Methods
+    def add(self, *change) -> None:
+        """Record a change, in the order it was made."""
+        self.changes.append(change)
+# endregion
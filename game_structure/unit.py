@@ -1,8 +1,24 @@
-from typing import Tuple, List
-from copy import deepcopy
+from typing import Container, Dict, Tuple, List
 import game_structure as gs
+import util.create_unit as create_unit
+import util.zobrist as zobrist
+
+# Equipement items, in the order of `Unit.equipement` counters
+EQUIPEMENT_VALUES = (gs.CardValue.RUNEMETAL, gs.CardValue.SCROLL, gs.CardValue.DRAGONSCALE, gs.CardValue.SHINING_HELM)
+EQUIPEMENT_INDEX = {value: i for i, value in enumerate(EQUIPEMENT_VALUES)}
+
+# Bonus of each item, as a fraction of power and resistance. The filters of the old card lists compared a card type with a
+# card value and never matched, so equipement has never had an effect in the game and the bonuses are 0.
+EQUIPEMENT_ATTACK = (0, 0, 0, 0)
+EQUIPEMENT_RESISTANCE = (0, 0, 0, 0)
+
+# Damage of an attack, keyed by the attacker power, bonus attack and attack tile flag and the defender resistance,
+# filled on first use by `Unit.get_damage`
+DAMAGE: Dict[Tuple[int, float, bool, float], int] = {}
 
 class Unit:
+    __slots__ = ('card', 'hp', 'archetype', 'pos', 'equipement', 'attack', 'defense', 'collection', 'uid')
+
     def __init__(
         self,
         card: 'gs.Card',
@@ -15,50 +31,156 @@ class Unit:
         pos: Tuple[int, int],
         equipement: List['gs.Card']
     ) -> None:
-        """Unit is a base class for all units that a player can use in the game."""
+        """Unit is a base class for all units that a player can use in the game.
+
+        Stats live in an `Archetype` of `util.create_unit` shared by reference, the unit only holds its mutable fields."""
         self.card = card
         self.hp = hp
-        self.max_hp = max_hp
-        self.speed = speed
-        self.power = power
-        self.range = range
-        self.resistance = resistance
+        self.archetype = create_unit.get_archetype(max_hp, speed, power, range, resistance)
         self.pos = pos
-        self.equipement = equipement
+        self.equipement = [0] * len(EQUIPEMENT_VALUES)      # count of each item of `EQUIPEMENT_VALUES`
+        for item in equipement:
+            if item.get_value() in EQUIPEMENT_INDEX:
+                self.equipement[EQUIPEMENT_INDEX[item.get_value()]] += 1
+        self.attack = 0     # bonus attack and resistance with the equipement, cached by `update_equipement_stats`
+        self.defense = 0
+        self.update_equipement_stats()
+        self.collection: 'gs.UnitsCollection' = None    # collection whose occupancy index tracks this unit
+        self.uid = -1       # stable id of the unit in its game, assigned by the first collection it is added to
+
+    @staticmethod
+    def from_archetype(card: 'gs.Card', archetype: 'create_unit.Archetype', hp: int, pos: Tuple[int, int], equipement: List[int] = None, uid: int = -1) -> 'Unit':
+        """Create a unit of a registered archetype, with the given equipement counters."""
+        unit = Unit.__new__(Unit)
+        unit.card = card
+        unit.hp = hp
+        unit.archetype = archetype
+        unit.pos = pos
+        unit.equipement = equipement if equipement is not None else [0] * len(EQUIPEMENT_VALUES)
+        unit.update_equipement_stats()
+        unit.collection = None
+        unit.uid = uid
+        return unit
 
 # region Methods
     def clone(self) -> 'Unit':
-        """Create new unit with the same info."""
-        return Unit(
-            self.card.clone(),
-            self.hp,
-            self.max_hp,
-            self.speed,
-            self.power,
-            self.range,
-            self.resistance,
-            self.pos,
-            deepcopy(self.equipement)
-        )
+        """Create new unit with the same info and id."""
+        unit = Unit.__new__(Unit)
+        unit.card = self.card
+        unit.hp = self.hp
+        unit.archetype = self.archetype
+        unit.pos = self.pos
+        unit.equipement = self.equipement.copy()
+        unit.attack = self.attack
+        unit.defense = self.defense
+        unit.collection = None
+        unit.uid = self.uid
+        return unit
 
     def copy_into(self, other: 'Unit') -> None:
-        """Copies the unit contents into another one."""
+        """Copies the unit contents and id into another one, keeping the indexes, aggregates and hash of its collection in sync."""
+        collection = other.collection
+        if collection is not None:
+            # the unit is untracked while it changes, so its position and id are updated in the indexes directly
+            collection.track_unit(other, -1)
+            del collection.grid[other.pos]
+            del collection.ids[other.uid]
         other.card = self.card.clone()
         other.hp = self.hp
-        other.max_hp = self.max_hp
-        other.speed = self.speed
-        other.power = self.power
-        other.range = self.range
-        other.resistance = self.resistance   
+        other.archetype = self.archetype
         other.pos = self.pos
-        other.equipement = deepcopy(self.equipement)
+        other.equipement = self.equipement.copy()
+        other.attack = self.attack
+        other.defense = self.defense
+        other.uid = self.uid
+        if collection is not None:
+            collection.grid[other.pos] = other
+            collection.ids[other.uid] = other
+            collection.track_unit(other)
+
+    def add_equipement(self, card: 'gs.Card') -> None:
+        """Equip a card, keeping the aggregates and the hash of its collection in sync. Cards that are not equipement are ignored."""
+        index = EQUIPEMENT_INDEX.get(card.get_value())
+        if index is None:
+            return
+        attack = self.attack
+        count = self.equipement[index]
+        self.equipement[index] = count + 1
+        self.update_equipement_stats()
+        if self.collection is not None:
+            self.collection.attack += self.attack - attack
+            self.collection.equipement_count += 1 if count == 0 else 0
+            self.collection.hash ^= zobrist.key(zobrist.EQUIPEMENT, card.value.value, self.pos[0], self.pos[1], count)
+
+    def remove_equipement(self, card: 'gs.Card') -> None:
+        """Unequip a card equiped by `add_equipement`."""
+        index = EQUIPEMENT_INDEX.get(card.get_value())
+        if index is None:
+            return
+        attack = self.attack
+        count = self.equipement[index] - 1
+        self.equipement[index] = count
+        self.update_equipement_stats()
+        if self.collection is not None:
+            self.collection.attack += self.attack - attack
+            self.collection.equipement_count -= 1 if count == 0 else 0
+            self.collection.hash ^= zobrist.key(zobrist.EQUIPEMENT, card.value.value, self.pos[0], self.pos[1], count)
+
+    @staticmethod
+    def get_damage(power: int, attack: float, is_on_attack_tile: bool, defense: float) -> int:
+        """Return the hp an attack takes, computed once per combination of stats with the formula of the rules."""
+        key = (power, attack, is_on_attack_tile, defense)
+        damage = DAMAGE.get(key)
+        if damage is None:
+            dmg = attack + 0.15 * power if is_on_attack_tile else attack
+            damage = DAMAGE[key] = int(dmg * (100 - defense) / 100)
+        return damage
+
+    def update_equipement_stats(self) -> None:
+        """Recompute the cached bonus attack, without the attack tile, and resistance of the unit and its equipement."""
+        power = self.archetype.power
+        self.attack = 0.5 * power if self.card.get_value() == gs.CardValue.CLERIC else power
+        self.defense = self.archetype.resistance
+        for i, count in enumerate(self.equipement):
+            if count > 0:
+                self.attack += count * EQUIPEMENT_ATTACK[i] * power
+                self.defense += count * EQUIPEMENT_RESISTANCE[i] * self.archetype.resistance
 # endregion
 
 # region Getters
+    @property
+    def max_hp(self) -> int:
+        """Stat of the archetype, kept as an attribute for compatibility."""
+        return self.archetype.max_hp
+
+    @property
+    def speed(self) -> int:
+        """Stat of the archetype, kept as an attribute for compatibility."""
+        return self.archetype.speed
+
+    @property
+    def power(self) -> int:
+        """Stat of the archetype, kept as an attribute for compatibility."""
+        return self.archetype.power
+
+    @property
+    def range(self) -> int:
+        """Stat of the archetype, kept as an attribute for compatibility."""
+        return self.archetype.range
+
+    @property
+    def resistance(self) -> int:
+        """Stat of the archetype, kept as an attribute for compatibility."""
+        return self.archetype.resistance
+
     def get_card(self) -> 'gs.Card':
         """Get unit card."""
         return self.card
 
+    def get_uid(self) -> int:
+        """Get unit id."""
+        return self.uid
+
     def get_pos(self) -> Tuple[int, int]:
         """Get unit position."""
         return self.pos
@@ -69,100 +191,112 @@ class Unit:
 
     def get_max_hp(self) -> int:
         """Get unit max hp."""
-        return self.max_hp
+        return self.archetype.max_hp
 
     def get_speed(self) -> int:
         """Get unit speed."""
-        return self.speed
+        return self.archetype.speed
 
     def get_power(self) -> int:
         """Get unit power."""
-        return self.power
+        return self.archetype.power
     
     def get_range(self) -> int:
         """Get unit range."""
-        return self.range
+        return self.archetype.range
 
     def get_resistance(self) -> int:
         """Get unit resistance."""
-        return self.resistance
+        return self.archetype.resistance
     
     def get_equipement(self) -> List['gs.Card']:
         """Get unit equipement."""
+        return [gs.Card(item, item.get_card_type()) for item, count in zip(EQUIPEMENT_VALUES, self.equipement) for _ in range(count)]
+
+    def get_equipement_counts(self) -> List[int]:
+        """Get the count of each item of `EQUIPEMENT_VALUES` equiped."""
         return self.equipement
     
-    def get_attack_equipement(self) -> List['gs.Card']:
-        """Get unit attack equipement."""
-        return [card for card in self.equipement if card.get_value() == gs.CardValue.RUNEMETAL and card.get_card_type() == gs.CardValue.SCROLL]
-    
-    def get_defense_equipement(self) -> List['gs.Card']:
-        """Get unit defense equipement."""
-        return [card for card in self.equipement if card.get_value() == gs.CardValue.DRAGONSCALE and card.get_card_type() == gs.CardValue.SHINING_HELM]
-    
     def get_unique_equipement(self) -> List['gs.Card']:
         """Get unit unique equipement."""
-        equipement = []
-        [equipement.append(card) for card in self.equipement if card not in equipement]
-        return equipement
+        return [gs.Card(item, item.get_card_type()) for item, count in zip(EQUIPEMENT_VALUES, self.equipement) if count > 0]
+
+    def get_unique_equipement_count(self) -> int:
+        """Get the number of different items equiped."""
+        return sum(1 for count in self.equipement if count > 0)
     
     def get_bonus_attack(self, is_on_attack_tile = False) -> int:
-        dmg = self.power
-        if self.card.get_value() == gs.CardValue.CLERIC:
-            dmg = 0.5 * self.power
-        for card in self.get_attack_equipement():
-            if card.get_card_type() == gs.CardValue.SCROLL:
-                dmg += 0.1 * self.power
-            else:
-                dmg += 0.2 * self.power
         if is_on_attack_tile:
-            dmg += 0.15 * self.power
-        return dmg
+            return self.attack + 0.15 * self.archetype.power
+        return self.attack
+
+    def get_defense(self) -> int:
+        """Get unit resistance with its equipement."""
+        return self.defense
+
+    def get_hash(self) -> int:
+        """Get the Zobrist hash of the unit, its hp, position and equipement."""
+        x, y = self.pos
+        value = zobrist.key(zobrist.UNIT, self.card.value.value, x, y, self.hp)
+        for item, count in zip(EQUIPEMENT_VALUES, self.equipement):
+            for i in range(count):
+                value ^= zobrist.key(zobrist.EQUIPEMENT, item.value, x, y, i)
+        return value
 # endregion
 
 # region Setters
     def set_hp(self, hp: int) -> None:
-        """Set unit hp."""
-        self.hp = min(hp, self.max_hp)
+        """Set unit hp, keeping the aggregates and the hash of its collection in sync."""
+        hp = min(hp, self.archetype.max_hp)
+        if self.collection is not None:
+            value = self.card.get_value()
+            if value.is_crystal_value():
+                self.collection.crystals_hp += max(hp, 0) - max(self.hp, 0)
+            self.collection.hash ^= zobrist.key(zobrist.UNIT, value.value, self.pos[0], self.pos[1], self.hp) \
+                ^ zobrist.key(zobrist.UNIT, value.value, self.pos[0], self.pos[1], hp)
+        self.hp = hp
 
     def set_pos(self, pos: Tuple[int, int]) -> None:
-        """Set unit position."""
-        self.pos = deepcopy(pos)
+        """Set unit position, keeping the occupancy index of its collection in sync."""
+        if self.collection is not None:
+            self.collection.move_unit(self, pos)
+        else:
+            self.pos = pos
 # endregion
 
 # region Helpers
-    def can_attack(self, enemy: 'gs.UnitsCollection') -> bool:
+    def can_attack(self, enemy: 'gs.UnitsCollection', geometry: 'gs.BoardGeometry' = None) -> bool:
         """Check if the unit can attack an enemy unit."""
-        return len(enemy.get_units_in_range(self)) > 0
+        return enemy.has_units_in_range(self, geometry)
     
-    def can_heal(self, units: 'gs.UnitsCollection') -> bool:
+    def can_heal(self, units: 'gs.UnitsCollection', geometry: 'gs.BoardGeometry' = None) -> bool:
         """Check if the unit can heal an ally unit."""
-        return len(units.get_units_in_range(self)) > 0 and self.card.get_value() == gs.CardValue.CLERIC
+        return self.card.get_value() == gs.CardValue.CLERIC and units.has_units_in_range(self, geometry)
 
-    def possible_moves(self, board_size: Tuple[int, int], is_on_speed_tile = False, taken_positions: List[Tuple[int, int]] = []) -> List[Tuple[int, int]]:
+    def possible_moves(self, geometry: 'gs.BoardGeometry', is_on_speed_tile = False, taken_positions: Container[Tuple[int, int]] = ()) -> List[Tuple[int, int]]:
         """Return a list of possible moves for the unit."""
-        moves = []
-        speed = self.speed if not is_on_speed_tile else self.speed + 1
-        for x in range(self.pos[0] - speed, self.pos[0] + speed + 1):
-            for y in range(self.pos[1] - speed, self.pos[1] + speed + 1):
-                if x >= 0 and x < board_size[0] and y >= 0 and y < board_size[1] and (x, y) != self.pos and (x, y) not in taken_positions:
-                    moves.append((x, y))
-        return moves
+        speed = self.archetype.speed if not is_on_speed_tile else self.archetype.speed + 1
+        return [pos for pos in geometry.get_moves(self.pos, speed) if pos not in taken_positions]
     
-    def is_in_range(self, other: 'Unit') -> bool:
+    def can_move(self, geometry: 'gs.BoardGeometry', is_on_speed_tile = False, taken_positions: Container[Tuple[int, int]] = ()) -> bool:
+        """Check if the unit has any of the `possible_moves`, without building the list."""
+        speed = self.archetype.speed if not is_on_speed_tile else self.archetype.speed + 1
+        return any(pos not in taken_positions for pos in geometry.get_moves(self.pos, speed))
+
+    def can_move_to(self, pos: Tuple[int, int], geometry: 'gs.BoardGeometry', is_on_speed_tile = False, taken_positions: Container[Tuple[int, int]] = ()) -> bool:
+        """Check if the position is one of the `possible_moves`, without building the list."""
+        speed = self.archetype.speed if not is_on_speed_tile else self.archetype.speed + 1
+        return pos is not None and geometry.is_move(self.pos, pos, speed) and pos not in taken_positions
+
+    def is_in_range(self, other: 'Unit', geometry: 'gs.BoardGeometry' = None) -> bool:
         """Check if the unit is in range of the other unit."""
-        return other.get_range() >= abs(self.pos[0] - other.pos[0]) + abs(self.pos[1] - other.pos[1])
+        if geometry is not None:
+            return self.pos in geometry.get_tiles_in_range(other.pos, other.archetype.range)
+        return other.archetype.range >= abs(self.pos[0] - other.pos[0]) + abs(self.pos[1] - other.pos[1])
     
     def attack_unit(self, other: 'Unit', is_on_attack_tile = False) -> None:
         """Attack other unit."""
-        dmg = self.get_bonus_attack(is_on_attack_tile)
-        res = other.resistance
-        for card in other.get_defense_equipement():
-            if card.get_card_type() == gs.CardValue.SHINING_HELM:
-                res += 0.1 * other.resistance
-            else:
-                res += 0.2 * other.resistance
-        intake = int(dmg * (100 - res) / 100)
-        other.set_hp(other.get_hp() - intake)
+        other.set_hp(other.hp - Unit.get_damage(self.archetype.power, self.attack, is_on_attack_tile, other.defense))
 # endregion
 
 # region Override
@@ -180,7 +314,6 @@ class Unit:
     
     def __eq__(self, other: 'Unit') -> bool:
         """Check if two units are equal."""
-        return self.card == other.card and self.hp == other.hp and self.max_hp == other.max_hp and self.speed == other.speed \
-            and self.power == other.power and self.range == other.range and self.resistance == other.resistance and self.pos == other.pos \
+        return self.card == other.card and self.hp == other.hp and self.archetype == other.archetype and self.pos == other.pos \
             and self.equipement == other.equipement
 # endregion
\ No newline at end of file
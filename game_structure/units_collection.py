@@ -1,36 +1,126 @@
-from typing import Dict, List, Tuple
-from copy import deepcopy
+from typing import Container, Dict, List, Tuple
 import game_structure as gs
 
 class UnitsCollection:
     """A collection of units the player will use during the game."""
 
-    def __init__(self) -> None:
+    def __init__(self, player: int = 0) -> None:
         self.units: List['gs.Unit'] = []
+        self.grid: Dict[Tuple[int, int], 'gs.Unit'] = {}    # occupancy index, kept in sync with unit positions
+        self.ids: Dict[int, 'gs.Unit'] = {}                 # units by `Unit.uid`
+        self.next_uid = player  # the units of player p get the ids p, p + 2, p + 4..., so ids are unique in the game
+        self.crystals_hp = 0    # running score aggregates, kept in sync by `track_unit` and the unit setters
+        self.attack = 0
+        self.alive = 0
+        self.equipement_count = 0   # number of different items equiped, summed over the units
+        self.hash = 0           # Zobrist hash of the units, see `gs.Unit.get_hash`
+        self.shared = False     # shared by copy-on-write clones, so it is never changed again, see `share`
 
 # region Methods
     def clone(self) -> 'UnitsCollection':
         """Create new collection with the same units."""
         new_units_collection = UnitsCollection()
         for unit in self.units:
-            new_units_collection.add_unit(unit.clone())
+            clone = unit.clone()
+            new_units_collection.units.append(clone)
+            new_units_collection.grid[clone.pos] = clone
+            new_units_collection.ids[clone.uid] = clone
+            clone.collection = new_units_collection
+        new_units_collection.next_uid = self.next_uid
+        new_units_collection.crystals_hp = self.crystals_hp
+        new_units_collection.attack = self.attack
+        new_units_collection.alive = self.alive
+        new_units_collection.equipement_count = self.equipement_count
+        new_units_collection.hash = self.hash
         return new_units_collection
 
+    def share(self) -> 'UnitsCollection':
+        """Mark the collection as shared by copy-on-write clones and return it. Its holders `copy` it before changing it."""
+        self.shared = True
+        return self
+
+    def copy(self) -> 'UnitsCollection':
+        """Create new collection sharing the units, which `own_unit` clones the first time they are changed."""
+        new_units_collection = UnitsCollection()
+        new_units_collection.units = self.units.copy()
+        new_units_collection.grid = self.grid.copy()
+        new_units_collection.ids = self.ids.copy()
+        new_units_collection.next_uid = self.next_uid
+        new_units_collection.crystals_hp = self.crystals_hp
+        new_units_collection.attack = self.attack
+        new_units_collection.alive = self.alive
+        new_units_collection.equipement_count = self.equipement_count
+        new_units_collection.hash = self.hash
+        return new_units_collection
+
+    def own_unit(self, unit: 'gs.Unit') -> 'gs.Unit':
+        """Return the unit ready to be changed: itself if it belongs to this collection, or a clone replacing it if it is shared with the one it was copied from."""
+        if unit.collection is self:
+            return unit
+        clone = unit.clone()
+        clone.collection = self
+        self.units[next(i for i, other in enumerate(self.units) if other is unit)] = clone
+        self.grid[clone.pos] = clone
+        self.ids[clone.uid] = clone
+        return clone
+
     def add_unit(self, unit: 'gs.Unit'):
         """Add a unit to the collection."""
         self.units.append(unit)
+        self.grid[unit.pos] = unit
+        self.index_unit(unit)
+        unit.collection = self
+        self.track_unit(unit)
 
     def add_units(self, units: List['gs.Unit']):
         """Add a list of units to the collection."""
-        self.units.extend(units)
+        for unit in units:
+            self.add_unit(unit)
+
+    def insert_unit(self, index: int, unit: 'gs.Unit'):
+        """Insert a unit at the given index of the collection."""
+        self.units.insert(index, unit)
+        self.grid[unit.pos] = unit
+        self.index_unit(unit)
+        unit.collection = self
+        self.track_unit(unit)
 
-    def remove_unit(self, unit: 'gs.Unit'):
-        """Remove a unit from the collection."""
-        self.units.remove(unit)
+    def remove_unit(self, unit: 'gs.Unit') -> int:
+        """Remove a unit from the collection and return the index it had."""
+        index = self.units.index(unit)
+        del self.units[index]
+        del self.grid[unit.pos]
+        del self.ids[unit.uid]
+        if unit.collection is self:
+            unit.collection = None
+        self.track_unit(unit, -1)
+        return index
 
     def move_unit(self, unit: 'gs.Unit', pos: Tuple[int, int]):
         """Move a unit to a new position."""
-        unit.pos = deepcopy(pos)
+        self.hash ^= unit.get_hash()
+        del self.grid[unit.pos]
+        unit.pos = pos
+        self.grid[pos] = unit
+        self.hash ^= unit.get_hash()
+
+    def index_unit(self, unit: 'gs.Unit'):
+        """Add the unit to the id index, giving it the next id of the player if it has none."""
+        if unit.uid < 0:
+            unit.uid = self.next_uid
+            self.next_uid += 2
+        self.ids[unit.uid] = unit
+
+    def track_unit(self, unit: 'gs.Unit', sign: int = 1):
+        """Add the unit to the running score aggregates and the hash, or take it out of them with `sign=-1`."""
+        self.hash ^= unit.get_hash()
+        value = unit.card.get_value()
+        if value.is_crystal_value():
+            self.crystals_hp += sign * max(unit.hp, 0)
+        elif value.is_unit_value():
+            self.alive += sign
+        self.attack += sign * unit.get_bonus_attack()
+        self.equipement_count += sign * unit.get_unique_equipement_count()
 # endregion
 
 # region Getters
@@ -44,54 +134,87 @@ class UnitsCollection:
     
     def get_unit_positions(self) -> List[Tuple[int, int]]:
         """Get all unit positions."""
-        return [unit.pos for unit in self.units]
+        return list(self.grid)
+
+    def get_occupancy(self, *others: 'gs.UnitsCollection') -> 'gs.BoardOccupancy':
+        """Get a view of the positions taken by the units of this collection and the given ones."""
+        return gs.BoardOccupancy(self.grid, *(other.grid for other in others))
 
     def get_available_units(self) -> List['gs.Unit']:
         """Get all units that are not dead."""
         return [unit for unit in self.units if unit.get_card().get_value().is_unit_value()]
     
-    def get_playable_units(self, units: 'gs.UnitsCollection', enemies: 'gs.UnitsCollection', board_size: Tuple[int, int], board: Dict[Tuple[int, int], 'gs.TileType'])\
+    def get_playable_units(self, units: 'gs.UnitsCollection', enemies: 'gs.UnitsCollection', geometry: 'gs.BoardGeometry', board: Dict[Tuple[int, int], 'gs.TileType'])\
         -> List[Tuple['gs.Unit', List[Tuple[int, int]], bool, bool]]:
         """Get all units that can be played."""
         playable_units = []
+        positions = units.get_occupancy(enemies)
         for unit in self.units:
-            positions = units.get_unit_positions()
-            positions.extend(enemies.get_unit_positions())
-            moves = unit.possible_moves(board_size, board[unit.get_pos()] == gs.TileType.SPEED, positions)
-            attack = unit.can_attack(enemies)
-            heal = unit.can_heal(units)
+            moves = unit.possible_moves(geometry, board[unit.get_pos()] == gs.TileType.SPEED, positions)
+            attack = unit.can_attack(enemies, geometry)
+            heal = unit.can_heal(units, geometry)
             if unit.get_card().get_value().is_unit_value() and (attack or heal or len(moves) > 0):
                 playable_units.append((unit, moves, attack, heal))
         return playable_units
         
-    def get_units_in_range(self, other: 'gs.Unit') -> List['gs.Unit']:
+    def get_units_in_range(self, other: 'gs.Unit', geometry: 'gs.BoardGeometry' = None) -> List['gs.Unit']:
         """Return a list of units in range of the unit."""
+        if geometry is not None:
+            tiles = geometry.get_tiles_in_range(other.pos, other.archetype.range)
+            return [unit for unit in self.units if unit.pos in tiles]
         return [unit for unit in self.units if unit.is_in_range(other)]
+
+    def has_units_in_range(self, other: 'gs.Unit', geometry: 'gs.BoardGeometry' = None) -> bool:
+        """Check if any unit is in range of the unit, without building the list of `get_units_in_range`."""
+        if geometry is not None:
+            tiles = geometry.get_tiles_in_range(other.pos, other.archetype.range)
+            return any(unit.pos in tiles for unit in self.units)
+        return any(unit.is_in_range(other) for unit in self.units)
     
-    def get_avalible_positions_for_spawn(self, player_1 = False, board_size: Tuple[int, int] = None, taken_positions: List[Tuple[int, int]] = []) -> List[Tuple[int, int]]:
-        """Return a list of positions where a unit can be spawned."""
-        taken_positions.extend(self.get_unit_positions())
+    def get_avalible_positions_for_spawn(self, player_1 = False, board_size: Tuple[int, int] = None, taken_positions: Container[Tuple[int, int]] = ()) -> List[Tuple[int, int]]:
+        """Return a list of positions where a unit can be spawned, skipping the ones in `taken_positions`."""
         if player_1 and board_size is not None:
-            return [(x, y) for x in range(5) for y in range(board_size[1] - 4, board_size[1]) if (x, y) not in taken_positions]
-        return [(x, y) for x in range(5) for y in range(4) if (x, y) not in taken_positions]
+            return [(x, y) for x in range(5) for y in range(board_size[1] - 4, board_size[1]) if (x, y) not in self.grid and (x, y) not in taken_positions]
+        return [(x, y) for x in range(5) for y in range(4) if (x, y) not in self.grid and (x, y) not in taken_positions]
     
+    def is_avalible_position_for_spawn(self, pos: Tuple[int, int], player_1 = False, board_size: Tuple[int, int] = None, taken_positions: Container[Tuple[int, int]] = ()) -> bool:
+        """Check if the position is one of `get_avalible_positions_for_spawn`, without building the list."""
+        rows = range(board_size[1] - 4, board_size[1]) if player_1 and board_size is not None else range(4)
+        return pos is not None and pos[0] in range(5) and pos[1] in rows and pos not in self.grid and pos not in taken_positions
+
     def get_unit_in_position(self, pos: Tuple[int, int]) -> 'gs.Unit':
         """Return the unit in the given position."""
-        return next((unit for unit in self.units if unit.pos == pos), None)
+        return self.grid.get(pos)
+
+    def get_unit_by_id(self, uid: int) -> 'gs.Unit':
+        """Return the unit with the given `Unit.uid`, or None if it is not in the collection."""
+        return self.ids.get(uid)
     
-    def get_units_alive(self) -> List['gs.Unit']:
-        """Return a list of all units that are not dead."""
-        return len(self.get_available_units())
+    def get_units_alive(self) -> int:
+        """Return the number of units that are not dead."""
+        return self.alive
+
+    def get_crystals_hp(self) -> int:
+        """Return the total hp of the crystals alive."""
+        return self.crystals_hp
+
+    def get_attack(self) -> float:
+        """Return the sum of the bonus attack of all units."""
+        return self.attack
+
+    def get_hash(self) -> int:
+        """Return the Zobrist hash of the units."""
+        return self.hash
     
     def get_units_equipement_count(self) -> int:
         """Return the total number of equipement on all units."""
-        return sum([len(unit.get_unique_equipement()) for unit in self.units])
+        return self.equipement_count
 # endregion
 
 # region Helpers
     def crystals_alive(self) -> bool:
         """Return True if there are crystals alive."""
-        return len(self.get_crystals()) > 0
+        return self.crystals_hp > 0
 # endregion
 
 # region Override
@@ -0,0 +1,78 @@
+from typing import List, Optional, Sequence
+import game_structure as gs
+
+class VectorGame:
+    """Holds N independent games as `ArrayState`s and steps all of them at once with encoded actions.
+
+    Actions are the indices of `BoardGeometry.encode_action`, so batched policies can pick them from the
+    legal action masks without building `Action` objects. Games that end are reset automatically."""
+
+    def __init__(self, game_parameters: 'gs.GameParameters', games: int) -> None:
+        self.game_parameters = game_parameters
+        self.games = games
+        self.states: List['gs.ArrayState'] = []
+        self.finished = 0
+        self.reset()
+
+# region Methods
+    def reset(self) -> None:
+        """Start a new game in every slot."""
+        self.states = [self.new_state() for _ in range(self.games)]
+
+    def step(self, actions: Sequence[int]) -> List[Optional[int]]:
+        """Play one legal encoded action in every game and return the winner of the games that ended (-1 on a draw), or None for the others."""
+        forward_model = self.game_parameters.forward_model
+        winners = []
+        for i, (state, action) in enumerate(zip(self.states, actions)):
+            forward_model.step(state, state.decode_action(action))
+            forward_model.on_turn_ended(state)
+            if forward_model.is_terminal(state):
+                winners.append(self.get_winner(state))
+                self.states[i] = self.new_state()
+                self.finished += 1
+            else:
+                winners.append(None)
+        return winners
+# endregion
+
+# region Getters
+    def get_action_space(self) -> int:
+        """Return the number of encoded actions, the length of the masks."""
+        return self.game_parameters.get_geometry().action_space
+
+    def get_action_indices(self) -> List[List[int]]:
+        """Return the legal encoded actions of every game."""
+        return [state.get_action_indices() for state in self.states]
+
+    def get_action_masks(self) -> List[bytearray]:
+        """Return the legal action mask of every game, with a 1 on the legal encoded actions."""
+        masks = []
+        action_space = self.game_parameters.get_geometry().action_space
+        for state in self.states:
+            mask = bytearray(action_space)
+            for index in state.get_action_indices():
+                mask[index] = 1
+            masks.append(mask)
+        return masks
+
+    def get_current_turns(self) -> List[int]:
+        """Return the player to move in every game."""
+        return [state.current_turn for state in self.states]
+
+    def get_winner(self, state: 'gs.ArrayState') -> int:
+        """Return the player with the highest score, or -1 on a draw, like `Game.get_winner`."""
+        if state.player_0_score > state.player_1_score:
+            return 0
+        elif state.player_1_score > state.player_0_score:
+            return 1
+        else:
+            return -1
+# endregion
+
+# region Helpers
+    def new_state(self) -> 'gs.ArrayState':
+        """Deal a new game and return it as an `ArrayState`."""
+        game_state = gs.GameState(self.game_parameters)
+        game_state.reset()
+        return gs.ArrayState.from_observation(game_state)
+# endregion
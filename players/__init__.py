@@ -2,5 +2,7 @@ from players.player import Player
 from players.random_player import RandomPlayer
 from players.osla_player import OSLAPlayer
 from players.human_player import HumanPlayer
-from players.mcts import MCTSPlayer
+from players.mcts import MCTSPlayer, MCTSRootParallelPlayer, MCTSTreeParallelPlayer, MCTSTranspositionPlayer, MCTSReplayPlayer
 from players.oe import OEPlayer
+
+from players.ntbea import NTBEAPlayer
\ No newline at end of file
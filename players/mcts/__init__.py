@@ -1 +1,9 @@
-from players.mcts.mcts_player import MCTSPlayer
\ No newline at end of file
+from players.mcts.mcts_player import MCTSPlayer
+from players.mcts.mcts_root_parallel_player import MCTSRootParallelPlayer
+from players.mcts.mcts_concurrent_node import MCTSConcurrentNode
+from players.mcts.mcts_tree_parallel_player import MCTSTreeParallelPlayer
+from players.mcts.transposition_table import TranspositionTable
+from players.mcts.mcts_transposition_node import MCTSTranspositionNode
+from players.mcts.mcts_transposition_player import MCTSTranspositionPlayer
+from players.mcts.mcts_replay_node import MCTSReplayNode
+from players.mcts.mcts_replay_player import MCTSReplayPlayer
\ No newline at end of file
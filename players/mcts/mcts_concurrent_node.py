@@ -0,0 +1,89 @@
+"""Node class for a tree shared by several MCTS threads."""
+from typing import Tuple
+from heuristics.heuristic import Heuristic
+from players.mcts.mcts_node import MCTSNode
+import threading
+import game_structure as gs
+
+class MCTSConcurrentNode(MCTSNode):
+    """Node of a tree searched by several threads at once.
+
+    Statistics are updated under a per-node lock, and a thread going through a node adds a virtual
+    loss to it so the other threads are steered towards different branches until it backpropagates."""
+    def __init__(self, observation: "gs.Observation", heuristic: "Heuristic", action: "gs.Action", parent: "MCTSNode" = None):
+        super().__init__(observation, heuristic, action, parent)
+        self.lock = threading.Lock()
+
+# region Methods
+    def visit(self, reward: float, virtual_loss: float = None) -> None:
+        """Visits the `Node`, replacing the virtual loss added by `add_virtual_loss` if one is given, even 0."""
+        with self.lock:
+            if virtual_loss is not None:
+                self.visits -= 1
+                self.reward += virtual_loss
+            self.visits += 1
+            self.reward += reward
+
+    def add_virtual_loss(self, virtual_loss: float) -> None:
+        """Counts a visit with a loss of `virtual_loss` until the thread going through the `Node` backpropagates."""
+        with self.lock:
+            self.visits += 1
+            self.reward -= virtual_loss
+
+    def remove_virtual_loss(self, virtual_loss: float) -> None:
+        """Removes a virtual loss added by `add_virtual_loss`."""
+        with self.lock:
+            self.visits -= 1
+            self.reward += virtual_loss
+
+    def add_child(self, child: "MCTSNode") -> None:
+        """Adds a child to the `Node` child list."""
+        with self.lock:
+            self.children.append(child)
+
+    def new_child(self, action: "gs.Action") -> "MCTSConcurrentNode":
+        """Creates a child of the `Node` for the action, whose observation is only created the first time it is used."""
+        return MCTSConcurrentNode(None, self.heuristic, action, self)
+
+    def extend(self, widening: Tuple[float, float] = None) -> bool:
+        """Extends the `Node` like `MCTSNode.extend`, unless another thread already did, and returns whether it did.
+
+        The children are lazy, so they are created outside the lock, which is only held to publish them."""
+        observation = self.get_observation()
+        if widening is not None:
+            with self.lock:
+                if self.widening is not None:
+                    return False
+                super().extend(widening)
+                return True
+        children = [self.new_child(action) for action in observation.iter_actions()]
+        with self.lock:
+            if len(self.children) > 0:
+                return False
+            self.children = children
+            return True
+
+    def widen(self) -> int:
+        """Adds children for the pending actions like `MCTSNode.widen`, one thread at a time."""
+        if len(self.pending) == 0:
+            return 0
+        with self.lock:
+            return super().widen()
+
+    def backpropagate(self, reward: float, virtual_loss: float = None) -> None:
+        """Backpropagates the reward to the `Node` and its parents, replacing the virtual loss they were given."""
+        node = self
+        while node is not None:
+            node.visit(reward, virtual_loss)
+            node = node.parent
+# endregion
+
+# region Getters
+    def get_observation(self) -> "gs.Observation":
+        """Returns the observation of the `Node`, created by a single thread the first time it is used."""
+        if self.observation is None:
+            with self.lock:
+                if self.observation is None:
+                    super().get_observation()
+        return self.observation
+# endregion
@@ -1,5 +1,5 @@
 """Node class for the tree used in MCTS"""
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from heuristics.heuristic import Heuristic
 import math
 import random
@@ -9,13 +9,15 @@ import game_structure as gs
 class MCTSNode:
     """Node class for the tree used in MCTS."""
     def __init__(self, observation: "gs.Observation", heuristic: "Heuristic", action: "gs.Action", parent: "MCTSNode" = None):
-        self.observation = observation
+        self.observation = observation      # None until the `Node` is first used, see `get_observation`
         self.heuristic = heuristic
         self.action = action
         self.parent = parent
         self.children = []
         self.visits = 0
         self.reward = 0
+        self.pending: List[int] = []    # encoded actions without a child yet when extended with progressive widening, decoded as they are added
+        self.widening: Tuple[float, float] = None
 
 # region Methods
     def visit(self, reward: float) -> None:
@@ -27,20 +29,48 @@ class MCTSNode:
         """Adds a child to the `Node` child list."""
         self.children.append(child)
 
-    def extend(self) -> None:
-        """Extends the `Node` by generating a child for each possible action"""
-        actions = self.observation.get_actions()
-        for action in actions:
-            new_observation = self.observation.clone()
-            self.observation.game_parameters.forward_model.step(new_observation, action)
-            self.children.append(MCTSNode(new_observation, self.heuristic, action, self))
+    def new_child(self, action: "gs.Action") -> "MCTSNode":
+        """Creates a child of the `Node` for the action, whose observation is only created the first time it is used."""
+        return MCTSNode(None, self.heuristic, action, self)
+
+    def extend(self, widening: Tuple[float, float] = None) -> None:
+        """Extends the `Node` by generating a child for each possible action, or for the ones allowed by the progressive widening `(k, alpha)` if given.
+
+        Children are lazy: their observation is only created the first time they are used, and with progressive widening
+        their action is only built when they are added."""
+        if widening is None:
+            for action in self.get_observation().iter_actions():
+                self.children.append(self.new_child(action))
+        else:
+            observation = self.get_observation()
+            pending = observation.get_action_indices()
+            if pending[0] == observation.game_parameters.get_geometry().pass_action:
+                pending = []
+            random.shuffle(pending)
+            self.pending = pending
+            self.widening = widening
+            self.widen()
+
+    def widen(self) -> int:
+        """Adds children for the pending actions until the `Node` has `k * visits ** alpha` of them and returns how many were added."""
+        if len(self.pending) == 0:
+            return 0
+        k, alpha = self.widening
+        limit = max(1, int(k * self.visits ** alpha))
+        added = 0
+        observation = self.get_observation()
+        while len(self.children) < limit and len(self.pending) > 0:
+            self.children.append(self.new_child(observation.decode_action(self.pending.pop())))
+            added += 1
+        return added
 
     def rollout(self) -> float:
         """Performs a random rollout from the `Node` and returns the reward."""
-        new_observation = self.observation.clone()
-        while not self.observation.game_parameters.forward_model.is_terminal(new_observation)\
-                and not self.observation.game_parameters.forward_model.is_turn_finished(new_observation):
-            self.observation.game_parameters.forward_model.step(new_observation, new_observation.get_random_action())
+        observation = self.get_observation()
+        new_observation = observation.clone(copy_on_write=True)
+        while not observation.game_parameters.forward_model.is_terminal(new_observation)\
+                and not observation.game_parameters.forward_model.is_turn_finished(new_observation):
+            observation.game_parameters.forward_model.step(new_observation, new_observation.get_random_action())
         return self.heuristic.get_reward(new_observation)
 
     def backpropagate(self, reward: float) -> None:
@@ -57,6 +87,18 @@ class MCTSNode:
         """Returns the `ASMACAG.Game.Action.Action` of the `Node`."""
         return self.action
 
+    def get_child_action(self, child: "MCTSNode") -> "gs.Action":
+        """Returns the action leading from the `Node` to the child."""
+        return child.get_action()
+
+    def get_observation(self) -> "gs.Observation":
+        """Returns the observation of the `Node`, creating it from the one of its parent the first time."""
+        if self.observation is None:
+            observation = self.parent.get_observation().clone(copy_on_write=True)
+            observation.game_parameters.forward_model.step(observation, self.action)
+            self.observation = observation
+        return self.observation
+
     def get_average_reward(self) -> float:
         """Returns the average reward of the `Node`"""
         return self.reward / self.visits if self.visits > 0 else -math.inf
@@ -104,6 +146,7 @@ class MCTSNode:
 
     def get_is_terminal(self) -> bool:
         """Returns whether the `Node` is terminal (as in the game is over or the turn is finished)."""
-        return self.observation.game_parameters.forward_model.is_terminal(self.observation) \
-            or self.observation.game_parameters.forward_model.is_turn_finished(self.observation)
+        observation = self.get_observation()
+        return observation.game_parameters.forward_model.is_terminal(observation) \
+            or observation.game_parameters.forward_model.is_turn_finished(observation)
 # endregion
\ No newline at end of file
@@ -1,4 +1,5 @@
 """Entity that plays a game by using the Monte Carlo Tree Search algorithm to choose all actions in a turn."""
+from typing import Tuple
 from players.mcts.mcts_node import MCTSNode
 from players import Player
 from heuristics import Heuristic
@@ -7,10 +8,14 @@ import game_structure as gs
 
 class MCTSPlayer(Player):
     """Entity that plays a game by using the Monte Carlo Tree Search algorithm to choose all actions in a turn."""
-    def __init__(self, heuristic: "Heuristic", c_value: float):
+    def __init__(self, heuristic: "Heuristic", c_value: float, array_state: bool = False, widening: Tuple[float, float] = None):
         self.heuristic = heuristic
         self.c_value = c_value
+        self.array_state = array_state  # search on an `ArrayState` copy of the observation
+        self.widening = widening        # progressive widening `(k, alpha)`: a node has at most `k * visits ** alpha` children
         self.turn = []
+        self.iterations = 0             # statistics of the last search
+        self.tree_size = 0
         super().__init__()
 
 # region Methods
@@ -26,30 +31,42 @@ class MCTSPlayer(Player):
     def compute_turn(self, observation: "gs.Observation", budget: float) -> None:
         """Computes a list of action for a complete turn using the Monte Carlo Tree Search algorithm and sets it as the turn."""
         t0 = time.time()
+        if self.array_state:
+            observation = gs.ArrayState.from_observation(observation)
+        root = self.search(observation, t0 + budget - 0.12)
+
+        # retrieve the turn
+        current_node = root
+        for i in range(observation.game_parameters.action_points_per_turn):
+            best_child = current_node.get_best_child_by_average()
+            if best_child is None:
+                self.turn.append(None)
+                continue
+            self.turn.append(current_node.get_child_action(best_child))
+            current_node = best_child
+
+    def search(self, observation: "gs.Observation", deadline: float) -> MCTSNode:
+        """Builds a tree from the observation until the `time.time()` deadline and returns its root."""
         root = MCTSNode(observation, self.heuristic, None)
-        root.extend()
+        root.extend(self.widening)
+        self.iterations = 0
+        self.tree_size = 1 + root.get_amount_of_children()
         current_node = root
 
-        while time.time() - t0 < budget - 0.12:
+        while time.time() < deadline:
+            self.tree_size += current_node.widen()
             best_child = current_node.get_best_child_by_ucb(self.c_value)
             if best_child.get_amount_of_children() > 0:
                 current_node = best_child
             else:
                 if not best_child.get_is_unvisited() and not best_child.get_is_terminal():
-                    best_child.extend()
+                    best_child.extend(self.widening)
+                    self.tree_size += best_child.get_amount_of_children()
                     best_child = best_child.get_random_child()
                 best_child.backpropagate(best_child.rollout())
+                self.iterations += 1
                 current_node = root
-
-        # retrieve the turn
-        current_node = root
-        for i in range(observation.game_parameters.action_points_per_turn):
-            best_child = current_node.get_best_child_by_average()
-            if best_child is None:
-                self.turn.append(None)
-                continue
-            self.turn.append(best_child.get_action() if best_child is not None else None)
-            current_node = best_child
+        return root
 # endregion
 
 # region Override
@@ -0,0 +1,46 @@
+"""Node class for an MCTS tree that rebuilds observations by replaying actions."""
+from typing import Optional, Tuple
+from players.mcts.mcts_node import MCTSNode
+import game_structure as gs
+
+class MCTSReplayNode(MCTSNode):
+    """Node that keeps the key of its action and its statistics, but usually no observation.
+
+    Only the root and the nodes whose depth is a multiple of the cache stride keep their observation.
+    The others rebuild it by replaying the actions from the closest ancestor that kept one."""
+    def __init__(self, key: Optional[Tuple], depth: int, parent: "MCTSReplayNode" = None, observation: "gs.Observation" = None):
+        super().__init__(observation, None, None, parent)
+        self.key = key
+        self.depth = depth
+
+# region Methods
+    def extend(self, observation: "gs.Observation", stride: int = 0) -> None:
+        """Extends the `Node` from its observation by generating a child for each possible action, keeping the observation of the children at a multiple of `stride` depth."""
+        depth = self.depth + 1
+        cache = stride > 0 and depth % stride == 0
+        for action in observation.get_actions():
+            new_observation = None
+            if cache:
+                new_observation = observation.clone(copy_on_write=True)
+                observation.game_parameters.forward_model.step(new_observation, action)
+            self.children.append(MCTSReplayNode(action.get_key(), depth, self, new_observation))
+# endregion
+
+# region Getters
+    def get_key(self) -> Tuple:
+        """Returns the `Action.get_key()` of the action leading to the `Node`."""
+        return self.key
+
+    def rebuild_observation(self) -> "gs.Observation":
+        """Returns a new observation of the `Node`, cloned from the closest ancestor that keeps one and replayed from there."""
+        keys = []
+        node = self
+        while node.observation is None:
+            keys.append(node.key)
+            node = node.parent
+        observation = node.observation.clone(copy_on_write=True)
+        forward_model = observation.game_parameters.forward_model
+        for key in reversed(keys):
+            forward_model.step(observation, observation.get_action(key))
+        return observation
+# endregion
@@ -0,0 +1,69 @@
+"""Entity that plays a game by using Monte Carlo Tree Search over nodes without observations to choose all actions in a turn."""
+from players.mcts.mcts_replay_node import MCTSReplayNode
+from players.mcts.mcts_player import MCTSPlayer
+from heuristics import Heuristic
+import time
+import game_structure as gs
+
+class MCTSReplayPlayer(MCTSPlayer):
+    """Entity that plays a game by using Monte Carlo Tree Search over nodes without observations to choose all actions in a turn.
+
+    Nodes keep the key of their action and their statistics. Observations are rebuilt by replaying the
+    actions from the root, or from the closest node kept every `stride` levels when `stride` is not 0."""
+    def __init__(self, heuristic: "Heuristic", c_value: float, stride: int = 0, array_state: bool = False):
+        super().__init__(heuristic, c_value, array_state)
+        self.stride = stride
+
+# region Methods
+    def compute_turn(self, observation: "gs.Observation", budget: float) -> None:
+        """Computes a list of action for a complete turn using the Monte Carlo Tree Search algorithm and sets it as the turn."""
+        t0 = time.time()
+        if self.array_state:
+            observation = gs.ArrayState.from_observation(observation)
+        root = self.search(observation, t0 + budget - 0.12)
+
+        # retrieve the turn, replaying it to rebuild the actions
+        current_node = root
+        observation = observation.clone()
+        for i in range(observation.game_parameters.action_points_per_turn):
+            best_child = current_node.get_best_child_by_average()
+            if best_child is None:
+                self.turn.append(None)
+                continue
+            action = observation.get_action(best_child.get_key())
+            self.turn.append(action)
+            observation.game_parameters.forward_model.step(observation, action)
+            current_node = best_child
+
+    def search(self, observation: "gs.Observation", deadline: float) -> MCTSReplayNode:
+        """Builds a tree from the observation until the `time.time()` deadline and returns its root."""
+        forward_model = observation.game_parameters.forward_model
+        root = MCTSReplayNode(None, 0, None, observation)
+        root.extend(observation, self.stride)
+        self.iterations = 0
+        self.tree_size = 1 + root.get_amount_of_children()
+        current_node = root
+
+        while time.time() < deadline:
+            best_child = current_node.get_best_child_by_ucb(self.c_value)
+            if best_child.get_amount_of_children() > 0:
+                current_node = best_child
+            else:
+                new_observation = best_child.rebuild_observation()
+                if not best_child.get_is_unvisited() and not forward_model.is_terminal(new_observation) and not forward_model.is_turn_finished(new_observation):
+                    best_child.extend(new_observation, self.stride)
+                    self.tree_size += best_child.get_amount_of_children()
+                    best_child = best_child.get_random_child()
+                    forward_model.step(new_observation, new_observation.get_action(best_child.get_key()))
+                while not forward_model.is_terminal(new_observation) and not forward_model.is_turn_finished(new_observation):
+                    forward_model.step(new_observation, new_observation.get_random_action())
+                best_child.backpropagate(self.heuristic.get_reward(new_observation))
+                self.iterations += 1
+                current_node = root
+        return root
+# endregion
+
+# region Override
+    def __str__(self):
+        return f"MCTSReplayPlayer[{self.c_value}, {self.stride}]"
+# endregion
@@ -0,0 +1,96 @@
+"""Entity that plays a game by merging the Monte Carlo Tree Searches of several worker processes to choose all actions in a turn."""
+from typing import Dict, List, Optional, Tuple
+from players.mcts.mcts_node import MCTSNode
+from players.mcts.mcts_player import MCTSPlayer
+from heuristics import Heuristic
+import multiprocessing
+import random
+import time
+import game_structure as gs
+
+class MCTSRootParallelPlayer(MCTSPlayer):
+    """Entity that plays a game by merging the Monte Carlo Tree Searches of several worker processes to choose all actions in a turn.
+
+    Every worker builds an independent tree from the same root until the same deadline. The statistics
+    of the visited nodes of each tree are summed by action, and the turn is extracted from the merged
+    statistics. The pool of workers is created on the first turn and reused until `close` is called, which
+    `Game.run` does when the game ends. `workers` defaults to the number of CPUs."""
+    def __init__(self, heuristic: "Heuristic", c_value: float, workers: Optional[int] = None, array_state: bool = False):
+        super().__init__(heuristic, c_value, array_state)
+        self.workers = workers if workers is not None else multiprocessing.cpu_count()
+        self.pool = None
+
+# region Methods
+    def compute_turn(self, observation: "gs.Observation", budget: float) -> None:
+        """Computes a list of action for a complete turn by merging the trees of the workers and sets it as the turn."""
+        t0 = time.time()
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(self.workers)
+        if self.array_state:
+            observation = gs.ArrayState.from_observation(observation)
+        depth = observation.game_parameters.action_points_per_turn
+        deadline = t0 + budget - 0.2    # leave time to send the trees back and merge them
+        tasks = [(self.heuristic, self.c_value, observation, deadline, depth, random.getrandbits(64)) for _ in range(self.workers)]
+        stats = {}
+        self.iterations = 0
+        self.tree_size = 0
+        for tree_stats, iterations, tree_size in self.pool.map(MCTSRootParallelPlayer.search_worker, tasks):
+            self.merge(stats, tree_stats)
+            self.iterations += iterations
+            self.tree_size += tree_size
+
+        # retrieve the turn, replaying it to find the action of each key
+        observation = observation.clone()
+        for i in range(depth):
+            if len(stats) == 0:
+                self.turn.append(None)
+                continue
+            key = max(stats, key=lambda key: stats[key][1] / stats[key][0])
+            action = next(action for action in observation.get_actions() if action.get_key() == key)
+            self.turn.append(action)
+            observation.game_parameters.forward_model.step(observation, action)
+            stats = stats[key][2]
+
+    def close(self) -> None:
+        """Stops the worker processes."""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+
+    def merge(self, stats: Dict[Tuple, List], other: Dict[Tuple, List]) -> None:
+        """Adds the statistics of a tree to the merged ones."""
+        for key, (visits, reward, children) in other.items():
+            node = stats.get(key)
+            if node is None:
+                stats[key] = [visits, reward, children]
+            else:
+                node[0] += visits
+                node[1] += reward
+                self.merge(node[2], children)
+
+    @staticmethod
+    def search_worker(task: Tuple) -> Tuple[Dict[Tuple, List], int, int]:
+        """Builds a tree in a worker process and returns the statistics of its visited nodes by action key."""
+        heuristic, c_value, observation, deadline, depth, seed = task
+        random.seed(seed)
+        player = MCTSPlayer(heuristic, c_value)
+        root = player.search(observation, deadline)
+        return MCTSRootParallelPlayer.get_stats(root, depth), player.iterations, player.tree_size
+
+    @staticmethod
+    def get_stats(node: MCTSNode, depth: int) -> Dict[Tuple, List]:
+        """Returns the visits, reward and children statistics of the visited children of a node, by action key."""
+        if depth == 0:
+            return {}
+        return {child.get_action().get_key(): [child.visits, child.reward, MCTSRootParallelPlayer.get_stats(child, depth - 1)]
+                for child in node.children if child.visits > 0}
+# endregion
+
+# region Override
+    def __del__(self) -> None:
+        """Stops the worker processes if the player is discarded without calling `close`."""
+        self.close()
+
+    def __str__(self):
+        return f"MCTSRootParallelPlayer[{self.c_value}, {self.workers}]"
+# endregion
@@ -0,0 +1,77 @@
+"""Node class for the directed acyclic graph used in MCTS with transpositions."""
+from typing import Dict, List, Optional
+from heuristics.heuristic import Heuristic
+from players.mcts.mcts_node import MCTSNode
+import game_structure as gs
+import players.mcts as mc
+import util.zobrist as zobrist
+
+class MCTSTranspositionNode(MCTSNode):
+    """Node of an MCTS graph where the actions reaching the same state share a single node.
+
+    A node can have several parents, so the action leading to each child is kept by the parent and
+    rewards are backpropagated along the selected path instead of the `parent` link."""
+    def __init__(self, observation: "gs.Observation", heuristic: "Heuristic", action: "gs.Action", parent: "MCTSNode" = None, table: "mc.TranspositionTable" = None):
+        super().__init__(observation, heuristic, action, parent)
+        self.table = table
+        self.actions: Dict[int, "gs.Action"] = {}   # action leading to each child from this node, by `id` of the child
+        self.key: Optional[int] = None          # table key, None until the `Node` is first selected, see `resolve`
+
+# region Methods
+    def new_child(self, action: "gs.Action") -> "MCTSTranspositionNode":
+        """Creates a child of the `Node` for the action, whose observation and table entry are only created the first time it is selected."""
+        return MCTSTranspositionNode(None, self.heuristic, action, self, self.table)
+
+    def extend(self) -> None:
+        """Extends the `Node` by generating a lazy child for each possible action, merged with the nodes in the table when first selected."""
+        for action in self.get_observation().iter_actions():
+            child = self.new_child(action)
+            self.children.append(child)
+            self.actions[id(child)] = action
+
+    def resolve(self, child: "MCTSTranspositionNode") -> "MCTSTranspositionNode":
+        """Looks up the state of a new child in the table and returns the node shared by it, replacing the child if it was already there."""
+        if child.key is not None:
+            return child
+        key = self.get_key(child.get_observation())
+        node = self.table.get(key)
+        if node is None:
+            child.key = key
+            self.table.put(key, child)
+            return child
+        action = self.actions.pop(id(child))
+        index = self.children.index(child)
+        if id(node) in self.actions:
+            del self.children[index]
+        else:
+            self.children[index] = node
+            self.actions[id(node)] = action
+        return node
+
+    def backpropagate_path(self, path: List["MCTSTranspositionNode"], reward: float) -> None:
+        """Backpropagates the reward to the `Node` and the nodes of the path that reached it."""
+        self.visit(reward)
+        for node in path:
+            node.visit(reward)
+# endregion
+
+# region Getters
+    def get_key(self, observation: "gs.Observation") -> int:
+        """Returns the table key of an observation, its state hash combined with the scores so merged nodes have the same reward."""
+        return observation.state_hash() ^ zobrist.key(zobrist.SCORE, observation.player_0_score, observation.player_1_score)
+
+    def get_child_action(self, child: "MCTSTranspositionNode") -> "gs.Action":
+        """Returns the action leading from the `Node` to the child."""
+        return self.actions[id(child)]
+
+    def get_best_child_by_ucb(self, c_value: float) -> "MCTSTranspositionNode":
+        """Returns the child of the `Node` with the highest UCB value, merging it with the table first."""
+        while True:
+            best_child = super().get_best_child_by_ucb(c_value)
+            if self.resolve(best_child) is best_child:
+                return best_child
+
+    def get_random_child(self) -> "MCTSTranspositionNode":
+        """Returns a random child of the `Node`, merging it with the table first."""
+        return self.resolve(super().get_random_child())
+# endregion
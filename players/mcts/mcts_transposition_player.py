@@ -0,0 +1,50 @@
+"""Entity that plays a game by using Monte Carlo Tree Search over a graph that merges transpositions to choose all actions in a turn."""
+from players.mcts.mcts_transposition_node import MCTSTranspositionNode
+from players.mcts.transposition_table import TranspositionTable
+from players.mcts.mcts_player import MCTSPlayer
+from heuristics import Heuristic
+import time
+import game_structure as gs
+
+class MCTSTranspositionPlayer(MCTSPlayer):
+    """Entity that plays a game by using Monte Carlo Tree Search over a graph that merges transpositions to choose all actions in a turn.
+
+    Action orderings that reach the same state (moving two units in either order, playing duplicate
+    cards) share a single node and its statistics, found through a bounded `TranspositionTable`."""
+    def __init__(self, heuristic: "Heuristic", c_value: float, table_size: int = 65536, array_state: bool = False):
+        super().__init__(heuristic, c_value, array_state)
+        self.table_size = table_size
+
+# region Methods
+    def search(self, observation: "gs.Observation", deadline: float) -> MCTSTranspositionNode:
+        """Builds a graph from the observation until the `time.time()` deadline and returns its root."""
+        table = TranspositionTable(self.table_size)
+        root = MCTSTranspositionNode(observation, self.heuristic, None, None, table)
+        root.extend()
+        self.iterations = 0
+        self.tree_size = 1
+        current_node = root
+        path = [root]
+
+        while time.time() < deadline:
+            best_child = current_node.get_best_child_by_ucb(self.c_value)
+            if best_child.get_amount_of_children() > 0:
+                current_node = best_child
+                path.append(best_child)
+            else:
+                if not best_child.get_is_unvisited() and not best_child.get_is_terminal():
+                    best_child.extend()
+                    path.append(best_child)
+                    best_child = best_child.get_random_child()
+                best_child.backpropagate_path(path, best_child.rollout())
+                self.iterations += 1
+                current_node = root
+                path = [root]
+        self.tree_size = 1 + table.get_created()
+        return root
+# endregion
+
+# region Override
+    def __str__(self):
+        return f"MCTSTranspositionPlayer[{self.c_value}]"
+# endregion
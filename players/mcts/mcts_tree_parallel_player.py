@@ -0,0 +1,67 @@
+"""Entity that plays a game by running several Monte Carlo Tree Search threads on a shared tree to choose all actions in a turn."""
+from typing import List
+from players.mcts.mcts_concurrent_node import MCTSConcurrentNode
+from players.mcts.mcts_player import MCTSPlayer
+from heuristics import Heuristic
+import threading
+import time
+import game_structure as gs
+
+class MCTSTreeParallelPlayer(MCTSPlayer):
+    """Entity that plays a game by running several Monte Carlo Tree Search threads on a shared tree to choose all actions in a turn.
+
+    Threads select, extend and roll out concurrently, using virtual loss to spread over the tree. On
+    CPython with the GIL they take turns, while on free-threaded builds they run on separate cores
+    without copying observations between processes."""
+    def __init__(self, heuristic: "Heuristic", c_value: float, threads: int = 4, virtual_loss: float = 1000, array_state: bool = False):
+        super().__init__(heuristic, c_value, array_state)
+        self.threads = threads
+        self.virtual_loss = virtual_loss
+
+# region Methods
+    def search(self, observation: "gs.Observation", deadline: float) -> MCTSConcurrentNode:
+        """Builds a tree from the observation with several threads until the `time.time()` deadline and returns its root."""
+        root = MCTSConcurrentNode(observation, self.heuristic, None)
+        root.extend()
+        counts = [0] * self.threads
+        sizes = [0] * self.threads
+        threads = [threading.Thread(target=self.search_thread, args=(root, deadline, counts, sizes, i)) for i in range(self.threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.iterations = sum(counts)
+        self.tree_size = 1 + root.get_amount_of_children() + sum(sizes)
+        return root
+
+    def search_thread(self, root: MCTSConcurrentNode, deadline: float, counts: List[int], sizes: List[int], index: int) -> None:
+        """Runs MCTS iterations on the shared tree until the deadline, counting them and the nodes created in `counts[index]` and `sizes[index]`."""
+        current_node = root
+        root.add_virtual_loss(self.virtual_loss)
+        while time.time() < deadline:
+            best_child = current_node.get_best_child_by_ucb(self.c_value)
+            if best_child.get_amount_of_children() > 0:
+                best_child.add_virtual_loss(self.virtual_loss)
+                current_node = best_child
+            else:
+                extend = not best_child.get_is_unvisited() and not best_child.get_is_terminal()
+                best_child.add_virtual_loss(self.virtual_loss)
+                if extend:
+                    if best_child.extend():
+                        sizes[index] += best_child.get_amount_of_children()
+                    best_child = best_child.get_random_child()
+                    best_child.add_virtual_loss(self.virtual_loss)
+                best_child.backpropagate(best_child.rollout(), self.virtual_loss)
+                counts[index] += 1
+                current_node = root
+                root.add_virtual_loss(self.virtual_loss)
+        # remove the virtual loss of the path interrupted by the deadline
+        while current_node is not None:
+            current_node.remove_virtual_loss(self.virtual_loss)
+            current_node = current_node.parent
+# endregion
+
+# region Override
+    def __str__(self):
+        return f"MCTSTreeParallelPlayer[{self.c_value}, {self.threads}]"
+# endregion
@@ -0,0 +1,44 @@
+"""Bounded table of nodes keyed by state hash, used by MCTS to merge transpositions."""
+from typing import List, Optional
+import players.mcts as mc
+
+class TranspositionTable:
+    """Bounded table of nodes keyed by state hash, used by MCTS to merge transpositions.
+
+    Every key maps to a single slot. When two keys collide on a slot, the node with the most visits is
+    kept, so the table never grows beyond `size` and the most searched states stay shared."""
+    def __init__(self, size: int):
+        self.size = size
+        self.keys: List[Optional[int]] = [None] * size
+        self.nodes: List[Optional["mc.MCTSTranspositionNode"]] = [None] * size
+        self.hits = 0
+        self.created = 0
+
+# region Methods
+    def get(self, key: int) -> "Optional[mc.MCTSTranspositionNode]":
+        """Returns the node stored with the key, or None."""
+        index = key % self.size
+        if self.keys[index] == key:
+            self.hits += 1
+            return self.nodes[index]
+        return None
+
+    def put(self, key: int, node: "mc.MCTSTranspositionNode") -> None:
+        """Stores a new node, unless its slot holds a node with more visits."""
+        self.created += 1
+        index = key % self.size
+        current = self.nodes[index]
+        if current is None or current.visits <= node.visits:
+            self.keys[index] = key
+            self.nodes[index] = node
+# endregion
+
+# region Getters
+    def get_hits(self) -> int:
+        """Returns the number of lookups that found a transposition."""
+        return self.hits
+
+    def get_created(self) -> int:
+        """Returns the number of new nodes put in the table, whether they were stored or not."""
+        return self.created
+# endregion
@@ -1,4 +1,4 @@
-from game_structure import Action, Unit, UnitType, Observation
+import game_structure as gs
 from typing import List
 
 class FitnessEvaluator:
@@ -7,42 +7,30 @@ class FitnessEvaluator:
         self.heuristic = heuristic
 
 # region Methods
-    def evaluate(self, parameters: list[int], observation: "Observation") -> float:
+    def evaluate(self, parameters: list[int], observation: "gs.Observation") -> float:
         """Calculates the fitness of a turn given by NTBEA as a parameter list, playing it from the given Observation."""
-        turn = self.ntbea_to_turn(parameters)
-        for action in turn:
-            observation.game_parameters.forward_model.step(observation, action)
+        for parameter in parameters:
+            observation.game_parameters.forward_model.step(observation, self.get_action_from_parameter(parameter, observation))
         return self.heuristic.get_reward(observation)
 
-    def ntbea_to_turn(self, ntbea_parameters: list[int]) -> "List[Action]":
-        """Converts a list of int parameters from NTBEA to a list of Action representing a turn."""
+    def ntbea_to_turn(self, ntbea_parameters: list[int], observation: "gs.Observation") -> "List[gs.Action]":
+        """Converts a list of int parameters from NTBEA to a list of Action representing a turn played from the given Observation, which is left unchanged."""
         turn = []
+        observation = observation.clone()
         for parameter in ntbea_parameters:
-            turn.append(self.get_action_from_parameter(parameter))
+            action = self.get_action_from_parameter(parameter, observation)
+            turn.append(action)
+            observation.game_parameters.forward_model.step(observation, action)
         return turn
 
-    def get_action_from_parameter(self, parameter: int) -> "Action":
-        """Converts an int parameter from NTBEA to an `ASMACAG.Game.Action.Action`."""
-        #if parameter < 2:
-        #    return Action(Card(CardType(parameter+2)))
-        #elif parameter < 8:
-        #    return Action(Card(CardType.NUMBER, 1), Card(CardType.NUMBER, parameter - 1))
-        #elif parameter < 14:
-        #    return Action(Card(CardType.NUMBER, 2), Card(CardType.NUMBER, parameter - 7))
-        #elif parameter < 20:
-        #    return Action(Card(CardType.NUMBER, 3), Card(CardType.NUMBER, parameter - 13))
-        #elif parameter < 26:
-        #    return Action(Card(CardType.NUMBER, 4), Card(CardType.NUMBER, parameter - 19))
-        #elif parameter < 32:
-        #    return Action(Card(CardType.NUMBER, 5), Card(CardType.NUMBER, parameter - 25))
-        #elif parameter < 38:
-        #    return Action(Card(CardType.NUMBER, 6), Card(CardType.NUMBER, parameter - 31))
+    def get_action_from_parameter(self, parameter: int, observation: "gs.Observation") -> "gs.Action":
+        """Converts an int parameter from NTBEA to an `Action` of the given Observation, or None if it is not valid there."""
+        action = observation.decode_action(parameter)
+        if action is None or not observation.is_action_valid(action):
+            return None
+        return action
 
-    def get_parameter_from_action(self, action: "Action") -> int:
+    def get_parameter_from_action(self, action: "gs.Action", observation: "gs.Observation") -> int:
         """Converts an Action to an int parameter for NTBEA."""
-        #if action.get_played_card().get_type() == CardType.DIV2 \
-        #        or action.get_played_card().get_type() == CardType.MULT2:
-        #    return action.get_played_card().get_type().value - 2
-        #elif action.get_played_card().get_type() == CardType.NUMBER:
-        #    return (action.get_played_card().get_number() - 1) * 6 + action.get_board_card().get_number() + 1
+        return observation.encode_action(action)
 # endregion
@@ -8,25 +8,24 @@ from players.ntbea.bandit_2d import Bandit2D
 from players.ntbea.fitness_evaluator import FitnessEvaluator
 from players import Player
 from heuristics import Heuristic
-from game_structure import Action, Observation
+import game_structure as gs
 
 class NTBEAPlayer(Player):
-    def __init__(self, heuristic: "Heuristic", dimensions: List[int], c_value: float, neighbours: int, mutation_rate: float, initializations: int):
+    def __init__(self, heuristic: "Heuristic", c_value: float, neighbours: int, mutation_rate: float, initializations: int):
         """Entity that plays a Game by using theNTBEA to model fitness and evolve a list of Action based on it, composing a turn."""
         self.c_value = c_value  # c parameter for UCB
         self.neighbours = neighbours  # amount of neighbours per iteration
         self.mutation_rate = mutation_rate
         self.initializations = initializations
 
-        self.dimensions = dimensions  # possible values per parameter
-        self.dimension_amount = len(dimensions)  # dimensions of the problem to solve
+        self.dimensions = []  # possible values per parameter, set from the game by `set_dimensions`
+        self.dimension_amount = 0  # dimensions of the problem to solve
 
         self.bandits1D = []  # 1D bandits
         self.bandits2D = []  # 2D bandits
-        self.bandit1D_amount = self.dimension_amount  # amount of 1D bandits
-        self.bandit2D_amount = (self.dimension_amount * (self.dimension_amount - 1)) / 2  # amount of 2D bandits
+        self.bandit1D_amount = 0  # amount of 1D bandits
+        self.bandit2D_amount = 0  # amount of 2D bandits
 
-        self.create_bandits()  # initialize the 1D and 2D bandits
         self.fitness = FitnessEvaluator(heuristic)
         self.heuristic = heuristic
 
@@ -34,18 +33,28 @@ class NTBEAPlayer(Player):
         self.turn = []  # selected turn to play
 
 # region Methods
-    def think(self, observation: "Observation", budget: float) -> "Action":
+    def think(self, observation: "gs.Observation", budget: float) -> "gs.Action":
         """Computes a list of Action for a complete turn using the NTBEA and returns them in order each time it's called during the turn."""
-        if observation.action_points_left == observation.game_parameters.amount_action_points:
+        if observation.action_points_left == observation.game_parameters.action_points_per_turn:
             self.turn.clear()
             self.bandits1D.clear()
             self.bandits2D.clear()
+            self.set_dimensions(observation)
             self.create_bandits()
             self.currents.clear()
             self.turn.clear()
             self.compute_turn(observation, budget, self.initializations)
+        if len(self.turn) == 0:
+            return None
         return self.turn.pop(0)
 
+    def set_dimensions(self, observation: "gs.Observation") -> None:
+        """Sets a parameter per action of a turn, whose values are the encoded actions of `BoardGeometry.action_space`."""
+        self.dimensions = [observation.game_parameters.get_geometry().action_space] * observation.game_parameters.action_points_per_turn
+        self.dimension_amount = len(self.dimensions)
+        self.bandit1D_amount = self.dimension_amount
+        self.bandit2D_amount = (self.dimension_amount * (self.dimension_amount - 1)) / 2
+
     def create_bandits(self) -> None:
         """Create the empty 1D and 2D bandits."""
         # Create empty 1D bandits
@@ -59,7 +68,7 @@ class NTBEAPlayer(Player):
                 new_bandit = Bandit2D(self.c_value)
                 self.bandits2D.append(new_bandit)
 
-    def compute_turn(self, observation: "Observation", budget: float, initializations: int) -> None:
+    def compute_turn(self, observation: "gs.Observation", budget: float, initializations: int) -> None:
         """Computes a list of Action for a complete turn using the NTBEA it as the turn."""
         t0 = time.time()
         current, score = self.valid_initialization(observation, initializations)
@@ -73,9 +82,9 @@ class NTBEAPlayer(Player):
                 current = new_current
                 score = new_score
             self.update_bandits(new_current, new_score)
-        self.turn = self.fitness.ntbea_to_turn(current)
+        self.turn = self.fitness.ntbea_to_turn(current, observation)
 
-    def valid_initialization(self, observation: "Observation", initializations: int) -> "Tuple[List[int], float]":
+    def valid_initialization(self, observation: "gs.Observation", initializations: int) -> "Tuple[List[int], float]":
         """Generates a given amount of complete valid turns randomly and adds their stats to the bandit-based model, returning the best turn found and the score it yielded."""
         population = []
         best_individual = None
@@ -92,12 +101,12 @@ class NTBEAPlayer(Player):
                 best_individual = individual
         return best_individual, best_score
 
-    def get_random_individual_valid(self, observation: "Observation") -> List[int]:
+    def get_random_individual_valid(self, observation: "gs.Observation") -> List[int]:
         """Generates a random turn that is valid for the given observation. Note that the observation state after running this method will be the result of playing the turn."""
         individual = []
         for i in range(self.dimension_amount):
             act = observation.get_random_action()
-            n = self.fitness.get_parameter_from_action(act)
+            n = self.fitness.get_parameter_from_action(act, observation)
             individual.append(n)
             observation.game_parameters.forward_model.step(observation, act)
         return individual
@@ -7,18 +7,20 @@ from players.oe.turn_genome import TurnGenome
 import game_structure as gs
 
 class OEPlayer(Player):
-    def __init__(self, heuristic: "Heuristic", population_size: int, mutation_rate: float, survival_rate: float) -> None:
+    def __init__(self, heuristic: "Heuristic", population_size: int, mutation_rate: float, survival_rate: float, array_state: bool = False) -> None:
         self.population_size = population_size
         self.mutation_rate = mutation_rate
         self.survival_rate = survival_rate
         self.heuristic = heuristic
+        self.array_state = array_state  # search on an `ArrayState` copy of the observation
         self.turn = []
+        self.generations = 0    # generations evolved by the last `compute_turn`
         super().__init__()
 
 # region Methods
     def think(self, observation: "gs.Observation", budget: float) -> "gs.Action":
         """Computes a list of actions for a complete turn using the Online Evolution algorithm and returns them in order each time it's called during the turn."""
-        if observation.action_points_left == observation.game_parameters.action_points_per_turn and len(self.turn) > 0:
+        if observation.action_points_left == observation.game_parameters.action_points_per_turn:
             self.turn.clear()
             self.compute_turn(observation, budget)
         if len(self.turn) == 0:
@@ -31,22 +33,27 @@ class OEPlayer(Player):
         population = []
         killed = []
 
+        if self.array_state:
+            observation = gs.ArrayState.from_observation(observation)
+        forward_model = observation.game_parameters.forward_model
+        # genomes play their actions on this observation and undo them afterwards, so it is never copied again
         new_observation = observation.clone()
         # initial population
         for i in range(self.population_size):
             genome = TurnGenome()
-            observation.copy_into(new_observation)
             genome.random(new_observation)
             population.append(genome)
             killed.append(genome)
 
+        self.generations = 0
         while time.time() - t0 < budget - 0.05:
+            self.generations += 1
             # evaluate the new genomes
             for genome in killed:
-                observation.copy_into(new_observation)
-                for action in genome.get_actions():
-                    observation.game_parameters.forward_model.step(new_observation, action)
+                records = [forward_model.apply(new_observation, action) for action in genome.get_actions()]
                 genome.set_reward(self.heuristic.get_reward(new_observation))
+                for record in reversed(records):
+                    forward_model.undo(new_observation, record)
 
             # kill the worst genomes
             killed.clear()
@@ -64,12 +71,10 @@ class OEPlayer(Player):
                     parent_b_index = random.randrange(first_killed_genome_index)
 
                 # crossover
-                observation.copy_into(new_observation)
                 killed_genome.crossover(population[parent_a_index], population[parent_b_index], new_observation)
 
                 # mutate
                 if random.random() < self.mutation_rate:
-                    observation.copy_into(new_observation)
                     killed_genome.mutate_at_random_index(new_observation)
 
         # select the best genome to use for the turn
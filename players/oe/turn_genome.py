@@ -1,5 +1,6 @@
 from typing import List
 import game_structure as gs
+import game_structure.rules as rl
 import random
 
 class TurnGenome:
@@ -9,17 +10,20 @@ class TurnGenome:
 
 # region Methods
     def random(self, observation: "gs.Observation"):
-        """Fills up this genome with random valid actions"""
+        """Fills up this genome with random valid actions. The observation is left unchanged."""
         self.actions.clear()
         self.reward = 0
+        records = []
         while not observation.game_parameters.forward_model.is_terminal(observation) and not observation.game_parameters.forward_model.is_turn_finished(observation):
             action = observation.get_random_action()
             self.actions.append(action)
-            observation.game_parameters.forward_model.step(observation, action)
+            records.append(observation.game_parameters.forward_model.apply(observation, action))
+        self.undo(observation, records)
 
     def crossover(self, parent_a: "TurnGenome", parent_b: "TurnGenome", observation: "gs.Observation"):
-        """Fills up this genome with a crossover of the two parents"""
+        """Fills up this genome with a crossover of the two parents. The observation is left unchanged."""
         self.reward = 0
+        records = []
         actions_count = min(observation.game_parameters.action_points_per_turn, len(self.actions))
         for i in range(actions_count):
             # choose a random parent and add action at index if valid, otherwise use the other parent
@@ -43,11 +47,13 @@ class TurnGenome:
             if not added:
                 self.actions[i] = observation.get_random_action()
 
-            observation.game_parameters.forward_model.step(observation, self.actions[i])
+            records.append(observation.game_parameters.forward_model.apply(observation, self.actions[i]))
+        self.undo(observation, records)
 
     def mutate_at_random_index(self, observation: "gs.Observation") -> None:
-        """Mutates this genome at a random action of the turn while keeping the whole turn valid. Note that the gs.observation state is not preserved."""
+        """Mutates this genome at a random action of the turn while keeping the whole turn valid. The observation is left unchanged."""
         mutation_index = random.randrange(len(self.actions))
+        records = []
         for i in range(len(self.actions)):
             if i == mutation_index:
                 self.actions[i] = observation.get_random_action()
@@ -55,7 +61,13 @@ class TurnGenome:
                 if not observation.is_action_valid(self.actions[i]):
                     self.actions[i] = observation.get_random_action()
 
-            observation.game_parameters.forward_model.step(observation, self.actions[i])
+            records.append(observation.game_parameters.forward_model.apply(observation, self.actions[i]))
+        self.undo(observation, records)
+
+    def undo(self, observation: "gs.Observation", records: List["rl.UndoRecord"]) -> None:
+        """Reverts the actions recorded while building this genome."""
+        for record in reversed(records):
+            observation.game_parameters.forward_model.undo(observation, record)
 
     def clone(self) -> "TurnGenome":
         """Returns a clone of this genome"""
@@ -4,21 +4,24 @@ import game_structure as gs
 import math
 
 class OSLAPlayer(Player):
-    def __init__(self, heuristic: 'Heuristic'):
+    def __init__(self, heuristic: 'Heuristic', array_state: bool = False):
         """Player class implemented for OSLA players."""
         self.heuristic = heuristic
+        self.array_state = array_state  # search on an `ArrayState` copy of the observation
 
 # region Methods
     def think(self, observation: 'gs.Observation', budget: float) -> 'gs.Action':
         """Think about the next action to take."""
         best_reward = -math.inf
         best_action = None
+        if self.array_state:
+            observation = gs.ArrayState.from_observation(observation)
+        forward_model = observation.game_parameters.forward_model
         current_observation = observation.clone()
-        actions = observation.get_actions()
-        for action in actions:
-            observation.copy_into(current_observation)
-            observation.game_parameters.forward_model.step(current_observation, action)
+        for action in observation.iter_actions():
+            record = forward_model.apply(current_observation, action)
             reward = self.heuristic.get_reward(current_observation)
+            forward_model.undo(current_observation, record)
             if reward >= best_reward:
                 best_action = action
                 best_reward = reward
@@ -6,3 +6,7 @@ class Player(ABC):
     @abstractmethod
     def think(self, observation: 'gs.Observation', budget: float) -> 'gs.Action':
         pass
+
+    def close(self) -> None:
+        """Releases the resources held by the player, called by `Game.run` when the game ends."""
+        pass
@@ -9,7 +9,7 @@ def start_game() -> Tuple['Game', List[Player]]:
     forward_model = SimpleForwardModel()
     parameters = GameParameters()
     parameters.forward_model = forward_model
-    players = [MCTSPlayer(SimpleHeuristic(), 8), OEPlayer(SimpleHeuristic(), 125, 0.15, 0.15)]
+    players = [MCTSPlayer(SimpleHeuristic(), 8, array_state=True), OEPlayer(SimpleHeuristic(), 125, 0.15, 0.15, array_state=True)]
     game = Game(parameters)
     budget = 6
     return (game, players, budget)
\ No newline at end of file
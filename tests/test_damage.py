@@ -0,0 +1,64 @@
+"""Exhaustive check of the damage of `Unit.attack_unit` against the formula of the rules."""
+from typing import List, Tuple
+import itertools
+import game_structure as gs
+from game_structure.unit import EQUIPEMENT_VALUES
+from util.create_unit import ARCHETYPES, Archetype
+
+# 0 to 2 copies of each item
+MIXES = list(itertools.product(range(3), repeat=len(EQUIPEMENT_VALUES)))
+
+def get_equipement_cards(mix: Tuple[int, ...]) -> List['gs.Card']:
+    """Return the equipement of a mix as the card list units kept before the counters."""
+    return [gs.Card(value, value.get_card_type()) for value, count in zip(EQUIPEMENT_VALUES, mix) for _ in range(count)]
+
+def get_reference_attack(value: 'gs.CardValue', archetype: Archetype, mix: Tuple[int, ...], is_on_attack_tile: bool) -> float:
+    """Return the bonus attack of a unit computed like the original `Unit.get_bonus_attack`, with its equipement filter."""
+    dmg = archetype.power
+    if value == gs.CardValue.CLERIC:
+        dmg = 0.5 * archetype.power
+    for card in [card for card in get_equipement_cards(mix) if card.get_value() == gs.CardValue.RUNEMETAL and card.get_card_type() == gs.CardValue.SCROLL]:
+        if card.get_card_type() == gs.CardValue.SCROLL:
+            dmg += 0.1 * archetype.power
+        else:
+            dmg += 0.2 * archetype.power
+    if is_on_attack_tile:
+        dmg += 0.15 * archetype.power
+    return dmg
+
+def get_reference_resistance(archetype: Archetype, mix: Tuple[int, ...]) -> float:
+    """Return the resistance of a unit computed like the original `Unit.attack_unit`, with its equipement filter."""
+    res = archetype.resistance
+    for card in [card for card in get_equipement_cards(mix) if card.get_value() == gs.CardValue.DRAGONSCALE and card.get_card_type() == gs.CardValue.SHINING_HELM]:
+        if card.get_card_type() == gs.CardValue.SHINING_HELM:
+            res += 0.1 * archetype.resistance
+        else:
+            res += 0.2 * archetype.resistance
+    return res
+
+def get_units() -> List[Tuple['gs.Unit', float]]:
+    """Return a unit of every archetype with every equipement mix, with its reference resistance."""
+    return [(gs.Unit.from_archetype(gs.Card(value, gs.CardType.UNIT), archetype, archetype.max_hp, (0, 0), list(mix)), get_reference_resistance(archetype, mix))
+            for value, archetype in ARCHETYPES.items() for mix in MIXES]
+
+def get_attackers() -> List[Tuple['gs.Unit', bool, float]]:
+    """Return a unit of every archetype with every equipement mix and attack tile flag, with its reference bonus attack."""
+    return [(gs.Unit.from_archetype(gs.Card(value, gs.CardType.UNIT), archetype, archetype.max_hp, (0, 0), list(mix)), is_on_attack_tile,
+             get_reference_attack(value, archetype, mix, is_on_attack_tile))
+            for value, archetype in ARCHETYPES.items() for mix in MIXES for is_on_attack_tile in (False, True)]
+
+def test_get_damage():
+    """Every combination of stats gets the damage of the formula."""
+    defenders = get_units()
+    for attacker, is_on_attack_tile, dmg in get_attackers():
+        for defender, res in defenders:
+            assert gs.Unit.get_damage(attacker.archetype.power, attacker.attack, is_on_attack_tile, defender.defense) == int(dmg * (100 - res) / 100)
+
+def test_attack_unit():
+    """Every attack takes the damage of the formula from the hp of the defender."""
+    defenders = get_units()
+    for attacker, is_on_attack_tile, dmg in get_attackers():
+        for defender, res in defenders:
+            defender.hp = defender.archetype.max_hp
+            attacker.attack_unit(defender, is_on_attack_tile)
+            assert defender.hp == defender.archetype.max_hp - int(dmg * (100 - res) / 100)
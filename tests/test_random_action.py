@@ -0,0 +1,89 @@
+"""Statistical check of the distribution of `get_random_action` against the one of listing every candidate."""
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+import math
+import random
+import game_structure as gs
+
+def get_observations() -> List['gs.Observation']:
+    """Return the observations at the start of some turns of seeded random games."""
+    observations = []
+    for seed in range(3):
+        random.seed(seed)
+        game_state = gs.GameState(gs.GameParameters())
+        game_state.reset()
+        forward_model = game_state.game_parameters.forward_model
+        for turn in range(12):
+            if forward_model.is_terminal(game_state):
+                break
+            if turn % 4 == 3:
+                observations.append(game_state.get_observation())
+            while not forward_model.is_turn_finished(game_state):
+                forward_model.step(game_state, game_state.get_observation().get_random_action())
+            forward_model.on_turn_ended(game_state)
+    return observations
+
+def get_reference_distribution(observation: 'gs.Observation') -> Dict[Tuple, float]:
+    """Return the probability of each action key when the playable units, their kinds of action and their targets are listed and drawn from."""
+    units = observation.player_0_units if observation.current_turn == 0 else observation.player_1_units
+    cards = observation.player_0_cards if observation.current_turn == 0 else observation.player_1_cards
+    enemy_units = observation.player_1_units if observation.current_turn == 0 else observation.player_0_units
+    geometry = observation.game_parameters.get_geometry()
+    positions = units.get_occupancy(enemy_units)
+    distribution = defaultdict(float)
+
+    playable_units = []
+    for unit in units.get_available_units():
+        options = [('move', unit.possible_moves(geometry, observation.board[unit.get_pos()] == gs.TileType.SPEED, positions)),
+                   ('attack', enemy_units.get_units_in_range(unit, geometry)),
+                   ('heal', units.get_units_in_range(unit, geometry) if unit.get_card().get_value() == gs.CardValue.CLERIC else [])]
+        options = [option for option in options if len(option[1]) > 0]
+        if len(options) > 0:
+            playable_units.append((unit, options))
+    unit_probability = 0 if len(playable_units) == 0 else 1 if cards.is_empty() else 0.5
+    for unit, options in playable_units:
+        for kind, targets in options:
+            probability = unit_probability / len(playable_units) / len(options) / len(targets)
+            for target in targets:
+                distribution[(unit.get_pos(), None, target) if kind == 'move' else (unit.get_pos(), target.get_pos(), None)] += probability
+
+    if not cards.is_empty():
+        card_probability = 1 - unit_probability
+        hand = cards.get_cards()
+        playable_cards = [card for card in hand if card.is_playable(units, enemy_units)]
+        if len(playable_cards) == 0:
+            for card in hand:
+                distribution[(card.get_value().value, None, None)] += card_probability / len(hand)
+        for card in playable_cards:
+            value = card.get_value()
+            if value.is_spell_value():
+                keys = [(value.value, None, enemy.get_pos()) for enemy in enemy_units.get_units()]
+            elif value == gs.CardValue.HEAL_POTION:
+                keys = [(value.value, None, unit.get_pos()) for unit in units.get_available_units()]
+            elif value.is_item_value():
+                keys = [(value.value, unit.get_pos(), None) for unit in units.get_available_units()]
+            else:
+                spawns = units.get_avalible_positions_for_spawn(observation.current_turn == 1, observation.game_parameters.board_size, enemy_units.get_occupancy())
+                keys = [(value.value, None, pos) for pos in spawns]
+            for key in keys:
+                distribution[key] += card_probability / len(playable_cards) / len(keys)
+    return distribution
+
+def check_distribution(states: List, samples: int = 6000) -> None:
+    """Check that the frequencies of the sampled actions are within five standard deviations of the reference probabilities."""
+    for observation, state in states:
+        distribution = get_reference_distribution(observation)
+        counts = Counter(action.get_key() for action in (state.get_random_action() for _ in range(samples)) if action is not None)
+        assert set(counts) <= set(distribution)
+        for key, probability in distribution.items():
+            assert abs(counts[key] / samples - probability) <= 5 * math.sqrt(probability * (1 - probability) / samples) + 1 / samples, key
+
+def test_observation():
+    """`Observation.get_random_action` keeps the distribution of drawing from the candidate lists."""
+    random.seed(0)
+    check_distribution([(observation, observation) for observation in get_observations()])
+
+def test_array_state():
+    """`ArrayState.get_random_action` keeps the distribution of drawing from the candidate lists."""
+    random.seed(0)
+    check_distribution([(observation, gs.ArrayState.from_observation(observation)) for observation in get_observations()])
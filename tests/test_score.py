@@ -0,0 +1,95 @@
+"""Differential check of `SimpleForwardModel.update_score` against the formula that re-sums the units of both players."""
+from typing import Union
+import random
+import game_structure as gs
+from game_structure.unit import EQUIPEMENT_VALUES
+
+def get_reference_attack(unit: 'gs.Unit') -> float:
+    """Return the bonus attack of a unit computed like the original `Unit.get_bonus_attack`, with its equipement filter."""
+    power = unit.archetype.power
+    dmg = power
+    if unit.get_card().get_value() == gs.CardValue.CLERIC:
+        dmg = 0.5 * power
+    equipement = [gs.Card(value, value.get_card_type()) for value, count in zip(EQUIPEMENT_VALUES, unit.equipement) for _ in range(count)]
+    for card in [card for card in equipement if card.get_value() == gs.CardValue.RUNEMETAL and card.get_card_type() == gs.CardValue.SCROLL]:
+        if card.get_card_type() == gs.CardValue.SCROLL:
+            dmg += 0.1 * power
+        else:
+            dmg += 0.2 * power
+    return dmg
+
+def get_reference_score(game_state: Union['gs.GameState', 'gs.Observation']) -> int:
+    """Return the score the current player gets from the original `update_score`."""
+    units = game_state.player_0_units if game_state.current_turn == 0 else game_state.player_1_units
+    enemy_units = game_state.player_1_units if game_state.current_turn == 0 else game_state.player_0_units
+    current_hp = sum(map(lambda unit: unit.get_hp(), units.get_crystals()))
+    enemy_hp = sum(map(lambda unit: unit.get_hp(), enemy_units.get_crystals()))
+    score = max((int((current_hp - enemy_hp) / 100)), 0)
+    current_attack = sum(map(get_reference_attack, units.get_units()))
+    enemy_attack = sum(map(get_reference_attack, enemy_units.get_units()))
+    score += max((int((current_attack - enemy_attack) / 10)), 0)
+    score += max((len(units.get_available_units()) - len(enemy_units.get_available_units())), 0) * 10
+    return score
+
+def get_score(game_state: Union['gs.GameState', 'gs.Observation', 'gs.ArrayState']) -> int:
+    """Return the score of the current player."""
+    return game_state.player_0_score if game_state.current_turn == 0 else game_state.player_1_score
+
+def test_games():
+    """Every step of seeded random games scores like the original formula, on both engines."""
+    for seed in range(8):
+        random.seed(seed)
+        game_state = gs.GameState(gs.GameParameters())
+        game_state.reset()
+        forward_model = game_state.game_parameters.forward_model
+        state = gs.ArrayState.from_observation(game_state)
+        turns = 0
+        while not forward_model.is_terminal(game_state) and not forward_model.is_terminal(state) and turns < 80:
+            while not forward_model.is_turn_finished(game_state):
+                action = game_state.get_observation().get_random_action()
+                score = get_score(game_state)
+                if forward_model.step(game_state, action):
+                    score += get_reference_score(game_state)
+                forward_model.step(state, action)
+                assert get_score(game_state) == score
+                assert (state.player_0_score, state.player_1_score) == (game_state.player_0_score, game_state.player_1_score)
+            forward_model.on_turn_ended(game_state)
+            forward_model.on_turn_ended(state)
+            turns += 1
+
+def test_apply_undo():
+    """Chains of applied actions score like the original formula on both engines, and undoing them restores the scores and aggregates."""
+    for seed in range(8):
+        random.seed(seed)
+        game_state = gs.GameState(gs.GameParameters())
+        game_state.reset()
+        forward_model = game_state.game_parameters.forward_model
+        turns = 0
+        while not forward_model.is_terminal(game_state) and turns < 80:
+            observation = game_state.get_observation().clone()
+            state = gs.ArrayState.from_observation(observation)
+            scores = (observation.player_0_score, observation.player_1_score)
+            records = []
+            while not forward_model.is_turn_finished(observation):
+                action = observation.get_random_action()
+                score = get_score(observation)
+                record = forward_model.apply(observation, action)
+                if record.result:
+                    score += get_reference_score(observation)
+                records.append((record, forward_model.apply(state, action)))
+                assert get_score(observation) == score
+                assert (state.player_0_score, state.player_1_score) == (observation.player_0_score, observation.player_1_score)
+            for record, array_record in reversed(records):
+                forward_model.undo(observation, record)
+                forward_model.undo(state, array_record)
+            assert (observation.player_0_score, observation.player_1_score) == scores
+            assert (state.player_0_score, state.player_1_score) == scores
+            score = get_score(observation)
+            forward_model.update_score(observation)
+            forward_model.update_score_array(state)
+            assert get_score(observation) == score + get_reference_score(observation)
+            assert get_score(state) == get_score(observation)
+            while not forward_model.is_turn_finished(game_state):
+                forward_model.step(game_state, game_state.get_observation().get_random_action())
+            forward_model.on_turn_ended(game_state)
+            turns += 1
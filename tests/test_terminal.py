@@ -0,0 +1,39 @@
+"""Check that both engines end the game and double the score of the next player in the same cases."""
+from typing import List
+import random
+import game_structure as gs
+
+def get_game_state(hand: List['gs.CardValue'], deck: List['gs.CardValue']) -> 'gs.GameState':
+    """Return a new game where the current player has no units nor cards, and the next one has the given hand and deck."""
+    random.seed(0)
+    game_state = gs.GameState(gs.GameParameters())
+    game_state.reset()
+    game_state.player_0_cards = gs.CardCollection()
+    game_state.player_1_cards = gs.CardCollection()
+    game_state.player_1_cards.add_cards([gs.Card(value, value.get_card_type()) for value in hand])
+    game_state.player_1_deck = gs.Deck(tuple(gs.Card(value, value.get_card_type()) for value in deck))
+    game_state.player_0_score = 7
+    game_state.player_1_score = 3
+    return game_state
+
+def check_terminal(hand: List['gs.CardValue'], deck: List['gs.CardValue'], scores: tuple) -> None:
+    """Check that `is_terminal` ends the game with the given scores on both engines."""
+    game_state = get_game_state(hand, deck)
+    forward_model = game_state.game_parameters.forward_model
+    state = gs.ArrayState.from_observation(game_state)
+    assert forward_model.is_terminal(game_state)
+    assert forward_model.is_terminal(state)
+    assert (game_state.player_0_score, game_state.player_1_score) == scores
+    assert (state.player_0_score, state.player_1_score) == scores
+
+def test_unit_cards_in_hand():
+    """The next player has units in hand, so it gets twice the score of the current player."""
+    check_terminal([gs.CardValue.INFERNO, gs.CardValue.KNIGHT], [], (7, 17))
+
+def test_unit_cards_in_deck():
+    """The next player has units in the deck, so it gets twice the score of the current player."""
+    check_terminal([gs.CardValue.INFERNO], [gs.CardValue.SCROLL, gs.CardValue.ARCHER], (7, 17))
+
+def test_no_unit_cards():
+    """The next player has no units anywhere, so the scores are kept."""
+    check_terminal([gs.CardValue.INFERNO], [gs.CardValue.SCROLL], (7, 3))
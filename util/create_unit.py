@@ -1,19 +1,38 @@
-from typing import Tuple
-from copy import deepcopy
+from typing import Dict, NamedTuple, Tuple
 import game_structure as gs
 
+class Archetype(NamedTuple):
+    """Immutable stats shared by reference by every unit of a kind."""
+    max_hp: int
+    speed: int
+    power: int
+    range: int
+    resistance: int
+
+    def __reduce__(self):
+        return (get_archetype, tuple(self))
+
+ARCHETYPES: Dict['gs.CardValue', Archetype] = {
+    gs.CardValue.ARCHER: Archetype(700, 2, 200, 4, 5),
+    gs.CardValue.KNIGHT: Archetype(1000, 1, 250, 1, 20),
+    gs.CardValue.CLERIC: Archetype(600, 1, 200, 2, 0),
+    gs.CardValue.WIZARD: Archetype(800, 2, 200, 2, 10),
+    gs.CardValue.NINJA: Archetype(700, 3, 200, 1, 5),
+    gs.CardValue.CRYSTAL: Archetype(4500, 0, 0, 0, 30),
+}
+
+_interned: Dict[Tuple[int, int, int, int, int], Archetype] = {archetype: archetype for archetype in ARCHETYPES.values()}
+
+def get_archetype(max_hp: int, speed: int, power: int, range: int, resistance: int) -> Archetype:
+    """Return the shared archetype with the given stats, registering it if no unit had them yet."""
+    stats = (max_hp, speed, power, range, resistance)
+    archetype = _interned.get(stats)
+    if archetype is None:
+        archetype = _interned[stats] = Archetype(*stats)
+    return archetype
+
 def create(card: 'gs.Card', position: Tuple[int, int]) -> 'gs.Unit':
-    if card.get_value() == gs.CardValue.ARCHER:
-        return gs.Unit(card.clone(), 700, 700, 2, 200, 4, 5, deepcopy(position), [])
-    elif card.get_value() == gs.CardValue.KNIGHT:
-        return gs.Unit(card.clone(), 1000, 1000, 1, 250, 1, 20, deepcopy(position), [])
-    elif card.get_value() == gs.CardValue.CLERIC:
-        return gs.Unit(card.clone(), 600, 600, 1, 200, 2, 0, deepcopy(position), [])
-    elif card.get_value() == gs.CardValue.WIZARD:
-        return gs.Unit(card.clone(), 800, 800, 2, 200, 2, 10, deepcopy(position), [])
-    elif card.get_value() == gs.CardValue.NINJA:
-        return gs.Unit(card.clone(), 700, 700, 3, 200, 1, 5, deepcopy(position), [])
-    elif card.get_value() == gs.CardValue.CRYSTAL:
-        return gs.Unit(card.clone(), 4500, 4500, 0, 0, 0, 30, deepcopy(position), [])
-    else:
-        return None
\ No newline at end of file
+    archetype = ARCHETYPES.get(card.get_value())
+    if archetype is None:
+        return None
+    return gs.Unit.from_archetype(card, archetype, archetype.max_hp, position)
@@ -0,0 +1,30 @@
+from typing import Any, Callable, Optional, Sequence, Tuple, TypeVar
+import random
+
+T = TypeVar('T')
+
+# Draws of `choice` before it falls back to counting the accepted items
+TRIES = 8
+
+def choice(items: Sequence[T], accept: Callable[[T], Any], tries: int = TRIES) -> Tuple[Optional[T], Any]:
+    """Return an item drawn uniformly among the ones `accept` gives a truthy value for, with that value, or `(None, None)` if there is none.
+
+    Random items are tried up to `tries` times, then the accepted ones are counted and one of them is picked by index,
+    so no list of candidates is built and the result is uniform either way."""
+    if len(items) == 0:
+        return None, None
+    for _ in range(tries):
+        item = items[random.randrange(len(items))]
+        value = accept(item)
+        if value:
+            return item, value
+    count = sum(1 for item in items if accept(item))
+    if count == 0:
+        return None, None
+    index = random.randrange(count)
+    for item in items:
+        value = accept(item)
+        if value:
+            if index == 0:
+                return item, value
+            index -= 1
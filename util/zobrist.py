@@ -0,0 +1,38 @@
+from functools import lru_cache
+
+MASK = (1 << 64) - 1
+
+# Feature kinds
+UNIT = 1
+EQUIPEMENT = 2
+CARD = 3
+TURN = 4
+ACTION_POINTS = 5
+SCORE = 6
+
+def to_signed(value: int) -> int:
+    """Return a 64-bit value as a signed integer, so hashes fit in an `array('q')` and XOR stays in range."""
+    return value - (1 << 64) if value >> 63 else value
+
+def mix(value: int) -> int:
+    """SplitMix64 finalizer, a bijection on 64-bit values."""
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK
+    return value ^ (value >> 31)
+
+@lru_cache(maxsize=None)
+def key(kind: int, *fields: int) -> int:
+    """Return the Zobrist key of a feature. Keys are derived from the fields, so they are the same in every process."""
+    value = kind
+    for field in fields:
+        value = mix((value + (field + 1) * 0x9E3779B97F4A7C15) & MASK)
+    return to_signed(value)
+
+def rotate(value: int) -> int:
+    """Rotate a hash by 32 bits, to tell apart the features of the second player."""
+    value &= MASK
+    return to_signed(((value << 32) | (value >> 32)) & MASK)
+
+def state_key(player_0_hash: int, player_1_hash: int, current_turn: int, action_points_left: int) -> int:
+    """Combine the hashes of both players with the turn and the action points left."""
+    return player_0_hash ^ rotate(player_1_hash) ^ key(TURN, current_turn) ^ key(ACTION_POINTS, action_points_left)